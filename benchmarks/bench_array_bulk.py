@@ -0,0 +1,90 @@
+"""
+Compare the bulk construction and clear paths of customTypes.Array against
+builtin lists and the former element by element implementation.
+Pure python, doesn't need maya.
+
+Usage:
+    python benchmarks/bench_array_bulk.py [-n 1000000] [-r 3]
+"""
+import argparse
+import timeit
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(
+    os.path.abspath(__file__)), "..", "src", "mayapyUtils"))
+
+import customTypes
+
+
+class _LegacyArray(customTypes.Array):
+    """
+    Array with the construction and clear paths from before the bulk rewrite.
+    """
+
+    def clear(self, value=None):
+        for i in range(len(self)):
+            self._elements[i] = value
+
+    def _fromIter(self, iterable):
+        try:
+            self._size = len(iterable)
+        except TypeError:
+            iterable = customTypes.LinkedList(iterable)
+            self._size = len(iterable)
+
+        self._buildArray()
+
+        for i, obj in enumerate(iterable):
+            self._elements[i] = obj
+
+
+def _cases(n):
+    source = list(range(n))
+
+    def gen():
+        return (i for i in range(n))
+
+    return [
+        ("sized/list", lambda: list(source)),
+        ("sized/Array", lambda: customTypes.Array(source)),
+        ("sized/legacy", lambda: _LegacyArray(source)),
+        ("generator/list", lambda: list(gen())),
+        ("generator/Array", lambda: customTypes.Array(gen())),
+        ("generator/legacy", lambda: _LegacyArray(gen())),
+        ("clear/list", lambda: source.__setitem__(slice(None), [None] * n)),
+        ("clear/Array", customTypes.Array(n).clear),
+        ("clear/legacy", _LegacyArray(n).clear),
+    ]
+
+
+def run(n, repeat):
+    """
+    Time every case and return the best run in seconds.
+
+    Args:
+        n ([Int]): Number of elements.
+        repeat ([Int]): Runs per case, the fastest one is kept.
+
+    Returns:
+        [List]: Pairs of case name and seconds.
+    """
+    return [(name, min(timeit.repeat(func, number=1, repeat=repeat)))
+            for name, func in _cases(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=10**6,
+                        help="Number of elements.")
+    parser.add_argument("-r", type=int, default=3, dest="repeat",
+                        help="Runs per case, the fastest one is reported.")
+    args = parser.parse_args()
+
+    print("[LOG] {0} elements, best of {1}".format(args.n, args.repeat))
+    for name, secs in run(args.n, args.repeat):
+        print("{0:<20}{1:>10.4f} s".format(name, secs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+"""
+Benchmark and regression suite for customTypes.Array and customTypes.LinkedList
+against the builtin list and collections.deque.
+Pure python, doesn't need maya.
+
+Every case is timed for the builtins and the custom containers, the custom timings
+are stored as ratios to the reference builtin (list) so baselines stay comparable
+between machines. A run is compared against the stored baseline and every ratio that
+got worse by more than the threshold (and by more than the noise floor) is reported as
+regression (exit code 1). Cases with a noisy ratio get a wider band, the spread of the
+per-round ratios of the run and the baseline is added to the threshold.
+Baselines are only compared for the same number of elements.
+
+Usage:
+    python benchmarks/bench_customTypes.py
+    python benchmarks/bench_customTypes.py --json report.json
+    python benchmarks/bench_customTypes.py --update-baseline
+"""
+import collections
+import argparse
+import platform
+import timeit
+import math
+import random
+import json
+import sys
+import gc
+import os
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "src", "mayapyUtils"))
+
+import customTypes
+
+try:
+    import tracemalloc
+except ImportError:
+    # -python 2.7 (mayapy), fall back to sys.getsizeof
+    tracemalloc = None
+
+
+BASELINE = os.path.join(HERE, "baselines", "customTypes.json")
+REFERENCE = "list"
+
+
+# ------------------------------ Helpers ------------------------------ #
+# --------------------------------------------------------------------- #
+
+
+def _deep_sizeof(obj):
+    """
+    Sum sys.getsizeof over everything reachable from obj, without the shared ints.
+    Only used when tracemalloc isn't available.
+
+    Args:
+        obj ([type]): Container to measure.
+
+    Returns:
+        [Int]: Size in bytes.
+    """
+    seen = set()
+    stack = [obj]
+    size = 0
+    while stack:
+        cur = stack.pop()
+        if id(cur) in seen or isinstance(cur, (int, float, type)):
+            continue
+        seen.add(id(cur))
+        size += sys.getsizeof(cur)
+        stack.extend(gc.get_referents(cur))
+    return size
+
+
+def _memory(factory, n):
+    """
+    Bytes per element the container built by factory needs, without the items.
+
+    Args:
+        factory ([Function]): Builds the filled container.
+        n ([Int]): Number of elements.
+
+    Returns:
+        [Float]: Bytes per element.
+    """
+    gc.collect()
+    if tracemalloc is None:
+        return _deep_sizeof(factory()) / float(n)
+
+    tracemalloc.start()
+    container = factory()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del container
+    return size / float(n)
+
+
+def _median(values):
+    values = sorted(values)
+    mid = len(values) // 2
+    return values[mid] if len(values) % 2 else (values[mid - 1] + values[mid]) / 2.0
+
+
+def _time_case(funcs, repeat, min_time=0.05, calls=None):
+    """
+    Median time of a single call for every container of a case. Calls are batched till
+    one batch takes at least min_time so tiny cases don't drown in timer noise.
+    The containers are timed in interleaved rounds, a slower machine phase hits all of
+    them instead of only the one timed at that moment, and the median of the rounds is used.
+
+    The noise of a container is the interquartile range of it's per-round ratios to the
+    reference, relative to their median.
+
+    Args:
+        funcs ([OrderedDict]): Container name -> function to time.
+        repeat ([Int]): Number of rounds.
+        min_time (Float, optional): Minimal seconds per batch. Defaults to 0.05.
+        calls ([Dict], optional): Container name -> operations per function call, the times
+                                  get divided by it. Defaults to None, 1 for all.
+
+    Returns:
+        [Tuple]: OrderedDicts of container name -> seconds per operation and container name -> noise.
+    """
+    numbers = {}
+    for name, func in funcs.items():
+        number = 1
+        while timeit.timeit(func, number=number) < min_time:
+            number *= 10
+        numbers[name] = number
+
+    calls = calls or {}
+    times = dict((name, []) for name in funcs)
+    for _ in range(repeat):
+        for name, func in funcs.items():
+            times[name].append(timeit.timeit(func, number=numbers[name]) /
+                               (numbers[name] * calls.get(name, 1)))
+
+    noise = collections.OrderedDict()
+    for name in funcs:
+        rel = sorted(t / r for t, r in zip(times[name], times[REFERENCE]))
+        quart = len(rel) // 4
+        noise[name] = (rel[-1 - quart] - rel[quart]) / _median(rel)
+
+    return collections.OrderedDict((name, _median(times[name])) for name in funcs), noise
+
+
+# ------------------------------- Cases ------------------------------- #
+# --------------------------------------------------------------------- #
+
+
+def _containers(source):
+    return collections.OrderedDict([
+        ("list", lambda: list(source)),
+        ("deque", lambda: collections.deque(source)),
+        ("Array", lambda: customTypes.Array(source)),
+        ("LinkedList", lambda: customTypes.LinkedList(source)),
+        ("LinkedList_indexed", lambda: customTypes.LinkedList(source, indexed=True)),
+    ])
+
+
+def run(n=100000, repeat=9, seed=0):
+    """
+    Run every case.
+
+    Args:
+        n (Int, optional): Number of elements per container. Defaults to 100000.
+        repeat (Int, optional): Runs per case, the median is kept. Defaults to 9.
+        seed (Int, optional): Seed for the random access patterns. Defaults to 0.
+
+    Returns:
+        [Tuple]: Case -> container -> seconds per operation (or bytes per element for 'memory'),
+                 and case -> container -> noise of the timed cases.
+    """
+    rnd = random.Random(seed)
+    source = list(range(n))
+    factories = _containers(source)
+    built = collections.OrderedDict((name, factory()) for name, factory in factories.items())
+
+    # -linked lists walk for every index, they get fewer lookups,
+    #   the index case is timed per lookup
+    lookups = [rnd.randrange(n) for _ in range(20000)]
+    linked_lookups = lookups[:200]
+    targets = [rnd.randrange(2 * n) for _ in range(200)]
+
+    results = collections.OrderedDict()
+    noise = collections.OrderedDict()
+
+    results["construct"], noise["construct"] = _time_case(factories, repeat)
+
+    def iterate(container):
+        return lambda: collections.deque(container, maxlen=0)
+    results["iterate"], noise["iterate"] = _time_case(collections.OrderedDict(
+        (name, iterate(c)) for name, c in built.items()), repeat)
+
+    def index(container, indices):
+        def func():
+            for i in indices:
+                container[i]
+        return func
+    per_call = dict((name, len(linked_lookups if name.startswith("LinkedList") else lookups))
+                    for name in built)
+    results["index"], noise["index"] = _time_case(collections.OrderedDict(
+        (name, index(c, linked_lookups if name.startswith("LinkedList") else lookups))
+        for name, c in built.items()), repeat, calls=per_call)
+
+    def append_pop(factory):
+        def func():
+            container = factory()
+            for i in range(1000):
+                container.append(i)
+            for _ in range(1000):
+                container.pop()
+        return func
+    empty = collections.OrderedDict([
+        ("list", list),
+        ("deque", collections.deque),
+        ("LinkedList", customTypes.LinkedList),
+        ("LinkedList_indexed", lambda: customTypes.LinkedList(indexed=True)),
+    ])
+    results["append_pop"], noise["append_pop"] = _time_case(collections.OrderedDict(
+        (name, append_pop(factory)) for name, factory in empty.items()), repeat)
+
+    def contains(container):
+        def func():
+            for t in targets:
+                t in container
+        return func
+    results["contains"], noise["contains"] = _time_case(collections.OrderedDict(
+        (name, contains(c)) for name, c in built.items() if name != "Array"), repeat)
+
+    del built
+    results["memory"] = collections.OrderedDict(
+        (name, _memory(factory, n)) for name, factory in factories.items())
+
+    return results, noise
+
+
+# ----------------------------- Reporting ----------------------------- #
+# --------------------------------------------------------------------- #
+
+
+def ratios(results):
+    """
+    Express every measurement relative to the reference builtin of it's case.
+
+    Args:
+        results ([Dict]): Output of run.
+
+    Returns:
+        [Dict]: Case -> container -> ratio to the reference.
+    """
+    res = collections.OrderedDict()
+    for case, values in results.items():
+        ref = values[REFERENCE]
+        res[case] = collections.OrderedDict(
+            (name, val / ref if ref else None) for name, val in values.items())
+    return res
+
+
+def compare(current, baseline, threshold, floor=0.1, noise=None, base_noise=None):
+    """
+    Find all ratios that got worse than the baseline by more than the threshold.
+    Tiny ratios (containers far faster than the reference) swing by large relative amounts,
+    a ratio also has to grow by more than the absolute floor to count.
+    The bigger noise of the run and the baseline widens the threshold of a ratio.
+
+    Args:
+        current ([Dict]): Ratios of this run.
+        baseline ([Dict]): Stored ratios.
+        threshold ([Float]): Allowed relative slowdown, eg. 0.5 for 50%.
+        floor (Float, optional): Allowed absolute ratio growth. Defaults to 0.1.
+        noise ([Dict], optional): Noise of this run, see _time_case. Defaults to None.
+        base_noise ([Dict], optional): Stored noise of the baseline. Defaults to None.
+
+    Returns:
+        [List]: Dictionaries describing each regression.
+    """
+    noise = noise or {}
+    base_noise = base_noise or {}
+
+    regressions = []
+    for case, values in current.items():
+        for name, ratio in values.items():
+            base = baseline.get(case, {}).get(name)
+            if base is None or ratio is None or math.isnan(ratio):
+                continue
+
+            band = max(noise.get(case, {}).get(name, 0.0),
+                       base_noise.get(case, {}).get(name, 0.0))
+            if ratio > base * (1.0 + threshold + band) and ratio - base > floor:
+                regressions.append({"case": case, "container": name,
+                                    "baseline": base, "current": ratio})
+    return regressions
+
+
+def _interpreter():
+    """
+    Key under which baselines are stored, ratios are only comparable within
+    the same python implementation and version.
+    """
+    return "{0}-{1}.{2}".format(platform.python_implementation(), *sys.version_info[:2])
+
+
+def report(results, noise, regressions, n, threshold):
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "interpreter": _interpreter(),
+            "platform": platform.platform(),
+            "n": n,
+            "threshold": threshold,
+            "reference": REFERENCE,
+        },
+        "results": results,
+        "ratios": ratios(results),
+        "noise": noise,
+        "regressions": regressions,
+    }
+
+
+def _print_table(results, rel):
+    for case, values in results.items():
+        unit = {"memory": "B/elem", "index": "s/look"}.get(case, "s")
+        print("\n{0}".format(case))
+        for name, val in values.items():
+            print("    {0:<20}{1:>14.6g} {2:<7}x{3:.2f}".format(
+                name, val, unit, rel[case][name]))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=100000,
+                        help="Number of elements per container.")
+    parser.add_argument("-r", type=int, default=9, dest="repeat",
+                        help="Runs per case, the median is kept.")
+    parser.add_argument("--json", default=None,
+                        help="Write the full report to this path.")
+    parser.add_argument("--baseline", default=BASELINE,
+                        help="Stored baselines to compare against, one entry per interpreter.")
+    parser.add_argument("--threshold", type=float, default=0.5,
+                        help="Allowed relative slowdown against the baseline.")
+    parser.add_argument("--floor", type=float, default=0.1,
+                        help="Allowed absolute ratio growth, keeps tiny ratios from flagging noise.")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Store the ratios of this run as new baseline.")
+    args = parser.parse_args()
+
+    results, noise = run(args.n, args.repeat)
+    rel = ratios(results)
+    _print_table(results, rel)
+
+    baselines = {}
+    if os.path.isfile(args.baseline):
+        with open(args.baseline) as f:
+            baselines = json.load(f)
+
+    regressions = []
+    interpreter = _interpreter()
+    if args.update_baseline:
+        if not os.path.isdir(os.path.dirname(args.baseline)):
+            os.makedirs(os.path.dirname(args.baseline))
+        baselines[interpreter] = report(results, noise, [], args.n, args.threshold)
+        with open(args.baseline, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print("\n[LOG] Baseline for {0} written to {1}".format(
+            interpreter, args.baseline))
+    elif interpreter in baselines and baselines[interpreter]["meta"]["n"] != args.n:
+        # -ratios depend on the container size, linked list walks grow with n
+        print("\n[LOG] Baseline for {0} was taken with n={1}, skipped the comparison for n={2}".format(
+            interpreter, baselines[interpreter]["meta"]["n"], args.n))
+    elif interpreter in baselines:
+        regressions = compare(
+            rel, baselines[interpreter]["ratios"], args.threshold, args.floor,
+            noise, baselines[interpreter].get("noise"))
+    else:
+        print("\n[LOG] No {0} baseline found in {1}".format(
+            interpreter, args.baseline))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report(results, noise, regressions, args.n, args.threshold),
+                      f, indent=2, sort_keys=True)
+
+    for reg in regressions:
+        print("[ERROR] Regression {case}/{container}: x{current:.2f} "
+              "(baseline x{baseline:.2f})".format(**reg))
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
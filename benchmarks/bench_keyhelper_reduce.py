@@ -0,0 +1,100 @@
+"""
+Benchmark the tolerance vs reduction trade-off of keyhelper.reduce_indices
+on synthetic capture data. Needs NumPy, doesn't need maya.
+
+The sample data mimics a baked VideoPose3D import: per-frame keys for translate
+channels (ui distance units) and rotate channels (degrees), smooth motion with
+sensor jitter on top. For every tolerance the kept key share, the max error of the
+linearly interpolated reduced curve and the runtime are reported.
+
+Usage:
+    python benchmarks/bench_keyhelper_reduce.py [--frames 10000] [--channels 51]
+"""
+import argparse
+import timeit
+import sys
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(
+    os.path.abspath(__file__)), "..", "src", "mayapyUtils"))
+
+import keyhelper
+
+
+# -channel kind -> (motion amplitude, jitter, tolerances to test)
+KINDS = {
+    "linear": (20.0, 0.02, [0.0, 0.005, 0.01, 0.05, 0.1]),
+    "angular": (90.0, 0.2, [0.0, 0.05, 0.1, 0.5, 1.0]),
+}
+
+
+def capture_channels(frames, channels, amplitude, jitter, seed=0):
+    """
+    Build per-frame keyed channels, a few overlaid slow sines with random phase,
+    some holds and gaussian jitter.
+
+    Args:
+        frames ([Int]): Keys per channel.
+        channels ([Int]): Number of channels.
+        amplitude ([Float]): Motion amplitude.
+        jitter ([Float]): Standard deviation of the noise.
+        seed (Int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        [Tuple]: Times (frames,) and values (channels, frames) as float64 arrays.
+    """
+    rnd = np.random.RandomState(seed)
+    times = np.arange(1, frames + 1, dtype=np.float64)
+
+    values = np.zeros((channels, frames))
+    for period in (240.0, 90.0, 35.0):
+        phase = rnd.uniform(0, 2 * np.pi, (channels, 1))
+        weight = rnd.uniform(0.2, 1.0, (channels, 1))
+        values += weight * np.sin(times / period * 2 * np.pi + phase)
+    values *= amplitude / 3.0
+
+    # -actors stand still every now and then
+    for ch in range(channels):
+        for start in rnd.randint(0, frames, frames // 500):
+            values[ch, start:start + rnd.randint(10, 120)] = values[ch, start]
+
+    values += rnd.normal(0, jitter, values.shape)
+    return times, values
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=10000,
+                        help="Keys per channel.")
+    parser.add_argument("--channels", type=int, default=51,
+                        help="Channels per kind, 17 joints x 3 axes by default.")
+    args = parser.parse_args()
+
+    print("{0:<9}{1:>10}{2:>12}{3:>12}{4:>12}".format(
+        "kind", "tolerance", "kept", "max error", "time"))
+
+    for kind, (amplitude, jitter, tolerances) in sorted(KINDS.items()):
+        times, values = capture_channels(
+            args.frames, args.channels, amplitude, jitter)
+
+        for tol in tolerances:
+            kept = 0
+            worst = 0.0
+            for vals in values:
+                idx = keyhelper.reduce_indices(times, vals, tol)
+                kept += len(idx)
+                worst = max(worst, np.abs(
+                    np.interp(times, times[idx], vals[idx]) - vals).max())
+
+            secs = min(timeit.repeat(
+                lambda: [keyhelper.reduce_indices(times, v, tol) for v in values],
+                number=1, repeat=3))
+
+            print("{0:<9}{1:>10g}{2:>11.1f}%{3:>12.4f}{4:>10.3f} s".format(
+                kind, tol, 100.0 * kept / values.size, worst, secs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Benchmark the run-length detection of static key ranges (keyhelper.static_ranges)
+against the former righelper implementation, on synthetic mocap-like curves.
+Needs NumPy, doesn't need maya.
+
+The synthetic curves are keyed on every frame starting at frame 1, they mix noisy
+motion with holds of random length, the same layout raw captures have.
+On these curves both implementations have to find the same ranges.
+Before timing, a few hand made curves check the edge cases of keyhelper.static_runs
+(empty input, min_length, a single run, drifting values within a tolerance).
+
+Usage:
+    python benchmarks/bench_keyhelper_static.py [--sizes 1000 5000 50000] [--legacy-max 10000]
+"""
+import argparse
+import timeit
+import sys
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(
+    os.path.abspath(__file__)), "..", "src", "mayapyUtils"))
+
+import keyhelper
+
+
+# ------------------------- Former implementation --------------------- #
+# --------------------------------------------------------------------- #
+
+
+def _listsplit_gap(lst):
+    # -pyUtils.pyhelper.listsplit_gap, split a sorted int list on gaps
+    res = [[]]
+    for i in lst:
+        if res[-1] and i != res[-1][-1] + 1:
+            res.append([])
+        res[-1].append(i)
+    return res
+
+
+def _get_key_ranges(keys):
+    ranges = []
+    last = None
+
+    for n, val in enumerate(keys):
+        t, k = val
+        if n == len(keys)-1:
+            ranges.append(add)
+            continue
+
+        if last != k:
+            if last is not None:
+                ranges.append(add)
+            last = k
+            add = {
+                "time": t,
+                "val": k
+            }
+        else:
+            add["time"] = t
+            add["val"] = k
+
+    return ranges
+
+
+def _get_keyframe_len(keys, cur_range):
+    cur_idx = keys.index([cur_range["time"], cur_range["val"]])
+    try:
+        srt = list(i for i in range(len(keys))
+                   if keys[i][1] == cur_range["val"] and i < cur_idx)
+        srt = min(_listsplit_gap(srt)[-1])
+    except (StopIteration, ValueError):
+        return 0
+
+    return len(keys[srt:cur_idx+1])
+
+
+def legacy_ranges(times, values):
+    keys = [[t, v] for t, v in zip(times.tolist(), values.tolist())]
+    ranges = _get_key_ranges(keys)
+
+    key_ranges = []
+    for n, r in enumerate(ranges):
+        if _get_keyframe_len(keys, r) <= 2:
+            continue
+
+        start = ranges[n-1]["time"] + 1 if n != 0 else 1
+        end = r["time"]
+
+        if end - start >= 2:
+            key_ranges.append((int(start + 1), int(end - 1)))
+
+    return key_ranges
+
+
+# ------------------------------ Curves ------------------------------- #
+# --------------------------------------------------------------------- #
+
+
+def synthetic_curve(num, seed=0, hold_ratio=0.5):
+    """
+    Build a per-frame keyed curve with random holds.
+
+    Args:
+        num ([Int]): Number of keys.
+        seed (Int, optional): Random seed. Defaults to 0.
+        hold_ratio (Float, optional): Rough share of keys inside holds. Defaults to 0.5.
+
+    Returns:
+        [Tuple]: Times and values as float64 arrays.
+    """
+    rnd = np.random.RandomState(seed)
+    times = np.arange(1, num + 1, dtype=np.float64)
+    # -keep every motion step clearly above the sensor noise used below
+    steps = rnd.normal(0, 1, num)
+    values = np.cumsum(np.sign(steps) * np.maximum(np.abs(steps), 0.01))
+
+    pos = 0
+    while pos < num:
+        pos += rnd.randint(1, 40)
+        if pos >= num:
+            break
+        length = rnd.randint(1, 60)
+        if rnd.rand() < hold_ratio:
+            values[pos:pos + length] = values[pos - 1]
+        pos += length
+
+    # -the former code never closes the last run, end on a unique value
+    values[-1] = values.max() + 1.0
+    return times, values
+
+
+# ---------------------------- Edge Cases ----------------------------- #
+# --------------------------------------------------------------------- #
+
+
+def check_edge_cases():
+    """
+    Assert the expected runs on small hand made curves, raises AssertionError on a mismatch.
+    """
+    # -empty input
+    assert keyhelper.static_runs([]) == []
+    assert keyhelper.static_runs([], tolerance=0.1) == []
+    assert keyhelper.static_ranges([], []) == []
+    assert len(keyhelper.interior_indices([])) == 0
+
+    # -min_length, runs shorter than it are dropped
+    values = [1.0, 1.0, 2.0, 2.0, 2.0, 3.0]
+    assert keyhelper.static_runs(values, min_length=1) == [(0, 1), (2, 4), (5, 5)]
+    assert keyhelper.static_runs(values, min_length=2) == [(0, 1), (2, 4)]
+    assert keyhelper.static_runs(values, min_length=3) == [(2, 4)]
+    assert keyhelper.static_runs(values, min_length=4) == []
+
+    # -a single run over the whole curve, the first and last key stay
+    times = np.arange(1, 7, dtype=np.float64)
+    for tol in (0.0, 0.1):
+        assert keyhelper.static_runs([5.0] * 6, tolerance=tol) == [(0, 5)]
+        assert keyhelper.static_ranges(times, [5.0] * 6, tolerance=tol) == [(2.0, 5.0)]
+    assert keyhelper.interior_indices([(0, 5)]).tolist() == [1, 2, 3, 4]
+
+    # -a slow drift with every step under the tolerance isn't merged into one run,
+    #   each run stays within the tolerance band
+    drift = np.arange(11) * 0.01
+    runs = keyhelper.static_runs(drift, tolerance=0.055)
+    assert runs == [(0, 5), (6, 10)]
+    for start, end in runs:
+        assert np.ptp(drift[start:end + 1]) <= 0.055
+    assert keyhelper.static_runs(drift, tolerance=0.0) == []
+
+
+# ------------------------------- Main -------------------------------- #
+# --------------------------------------------------------------------- #
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[1000, 5000, 10000, 50000],
+                        help="Number of keys per curve.")
+    parser.add_argument("--legacy-max", type=int, default=10000,
+                        help="Skip the quadratic former code above this size.")
+    parser.add_argument("-r", type=int, default=3, dest="repeat",
+                        help="Runs per case, the fastest one is reported.")
+    args = parser.parse_args()
+
+    check_edge_cases()
+
+    print("{0:>8}{1:>8}{2:>14}{3:>14}{4:>14}{5:>10}".format(
+        "keys", "ranges", "exact", "tolerance", "former", "speedup"))
+
+    for num in args.sizes:
+        times, values = synthetic_curve(num)
+        # -sensor noise on top of the holds, only the tolerance pass sees them as static
+        noisy = values + np.random.RandomState(1).uniform(-1e-4, 1e-4, num)
+
+        found = keyhelper.static_ranges(times, values)
+        assert keyhelper.static_ranges(times, noisy, tolerance=2e-4) == found
+
+        exact = min(timeit.repeat(lambda: keyhelper.static_ranges(times, values),
+                                  number=1, repeat=args.repeat))
+        tol = min(timeit.repeat(lambda: keyhelper.static_ranges(times, noisy, tolerance=2e-4),
+                                number=1, repeat=args.repeat))
+
+        former = float("nan")
+        if num <= args.legacy_max:
+            assert legacy_ranges(times, values) == found
+            former = min(timeit.repeat(lambda: legacy_ranges(times, values),
+                                       number=1, repeat=1))
+
+        print("{0:>8}{1:>8}{2:>12.4f} s{3:>12.4f} s{4:>12.4f} s{5:>9.0f}x".format(
+            num, len(found), exact, tol, former, former / exact))
+
+
+if __name__ == "__main__":
+    main()
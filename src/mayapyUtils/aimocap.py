@@ -3,8 +3,14 @@ import torch
 import numpy as np
 
 import argparse
+import threading
+import socket
+import queue
+import time
+import copy
 import pyhelper
 import pathlib
+import posehelper
 import static
 import json
 import sys
@@ -28,6 +34,11 @@ def np2json(arr, outpath):
         json.dump(arr, f, ensure_ascii=False, indent=4, cls=NumpyEncoder)
 
 
+def np2pose(arr, outpath, fps=None):
+    # -compact binary alternative to np2json, see posehelper.write_pose
+    posehelper.write_pose(outpath, arr, fps)
+
+
 def _get_first_search(path, ext=".npz"):
     for dirpath, _, filenames in os.walk(path):
         for filename in [f for f in filenames if f.endswith(ext)]:
@@ -41,12 +52,20 @@ def _parse_args():
     parser.add_argument("-r", required=True, dest="repo", type=pathlib.Path,
                         help="Path to the video-to-pose repo.")
     parser.add_argument("-i", required=True, dest="input", type=pathlib.Path,
-                        help="Path to the video which should be infered.")
+                        help="Path to the video which should be infered, the job directory with --worker.")
     parser.add_argument("-out", "--viz_output", type=pathlib.Path,
                         default=None, help="Path to which the output should be saved.")
     parser.add_argument("-det", "--detector_2d", type=str, default="alpha_pose",
                         help="Determine which 2d keypoint detector should be used.")
 
+    parser.add_argument("-w", "--window", type=int, default=1024,
+                        help="Frames detected and lifted at once, chunks flowing through the pipeline.")
+    parser.add_argument("-q", "--queue", type=int, default=4,
+                        help="Chunks waiting between two pipeline stages.")
+
+    parser.add_argument("-wk", "--worker", action="store_true",
+                        help="Keep the model loaded and process the jobs queued in the input directory.")
+
     group = parser.add_mutually_exclusive_group()
     group.add_argument("-sdm", "--send_maya", action="store_true",
                        help="Send result to maya (if server is running).")
@@ -56,23 +75,87 @@ def _parse_args():
     return parser.parse_args()
 
 
-def _send_to_maya(data):
-    client = pyhelper.ClientBase()
+def _send_to_maya(data, chunk_size=500):
     try:
-        client.connect()
-        client.send(data, json_cls=NumpyEncoder)
-        print("[LOG] Successfully send rotation to maya.")
+        if chunk_size:
+            reply = send_to_maya_chunked(data, chunk_size)
+            if not reply.get("success"):
+                raise RuntimeError(reply.get("msg"))
+            print("[LOG] Successfully send rotation to maya.")
+            return
+
+        client = pyhelper.ClientBase()
+        try:
+            client.connect()
+            client.send(data, json_cls=NumpyEncoder)
+            print("[LOG] Successfully send rotation to maya.")
+        finally:
+            client.disconnect()
     except Exception as err:
         print("[ERROR] Error occured:\n{0}".format(err))
-    finally:
-        client.disconnect()
 
 
-def _array_radians(arr):
-    return np.radians(arr)
+def _frame_message(data):
+    # -same framing as mahelper.ServerBase, zero padded byte length followed by the json body
+    body = json.dumps(data, cls=NumpyEncoder).encode("utf-8")
+    return str(len(body)).zfill(static.HEADER_SIZE).encode() + body
 
 
-array_radians = np.frompyfunc(_array_radians, 1, 1)
+def _read_message(sock):
+    def read(size):
+        buf = b""
+        while len(buf) < size:
+            part = sock.recv(size - len(buf))
+            if not part:
+                raise ConnectionError("Connection closed by maya.")
+            buf += part
+        return buf
+
+    return json.loads(read(int(read(static.HEADER_SIZE))).decode("utf-8"))
+
+
+def send_to_maya_chunked(frames, chunk_size=500, queue_size=4, host=static.HOST, port=static.PORT):
+    """
+    Send frames to a running pose2maya.PoseMayaServer in chunks.
+    An encoder thread serializes the chunks while the socket writer sends the finished ones,
+    maya starts keying the first chunk while the rest is still in flight.
+
+    Args:
+        frames ([List/Array]): Joint positions per frame, shape (N, 17, 3).
+        chunk_size (int, optional): Frames per message. Defaults to 500.
+        queue_size (int, optional): Encoded chunks waiting for the socket. Defaults to 4.
+        host ([str], optional): Host of the server. Defaults to static.HOST.
+        port ([int], optional): Port of the server. Defaults to static.PORT.
+
+    Returns:
+        [dict]: The reply of the server.
+    """
+    encoded = queue.Queue(maxsize=queue_size)
+
+    def encode():
+        try:
+            encoded.put(_frame_message({"type": "begin", "frames": len(frames)}))
+            for start in range(0, len(frames), chunk_size):
+                chunk = frames[start:start + chunk_size]
+                encoded.put(_frame_message({"type": "chunk", "start": start, "frames": chunk}))
+            encoded.put(_frame_message({"type": "end"}))
+        except Exception as err:
+            encoded.put(err)
+        encoded.put(None)
+
+    encoder = threading.Thread(target=encode, daemon=True)
+    encoder.start()
+
+    with socket.create_connection((host, port)) as sock:
+        while True:
+            message = encoded.get()
+            if message is None:
+                break
+            if isinstance(message, Exception):
+                raise message
+            sock.sendall(message)
+
+        return _read_message(sock)
 
 
 def _pose_args(repo):
@@ -136,7 +219,16 @@ def _pose_args(repo):
 # --------------------------------------------------------------------- #
 
 
-def videpose_infer(args):
+def videpose_infer(args, save_bundle=False):
+    """
+    Infer the 3d poses of a video in one go, see infer_pipeline for the staged version.
+
+    Args:
+        args ([arguments]): Arguments as given by _pose_args.
+        save_bundle (bool, optional): Also write 'pose_bundle.npz' for maya, the rotations of
+                                      clips longer than 4096 frames get computed in a process pool.
+                                      Defaults to False.
+    """
     from common.camera import normalize_screen_coordinates, camera_to_world, image_coordinates
     from common.generators import UnchunkedGenerator
     from common.model import TemporalModel
@@ -206,12 +298,16 @@ def videpose_infer(args):
     np.save(args.viz_output / "test_3d_output.npy",
             prediction, allow_pickle=True)
 
-    rot = np.array([0.14070565, -0.15007018, -0.7552408,
-                   0.62232804], dtype=np.float32)
+    rot = np.array(static.VideoPoseCameraRotation, dtype=np.float32)
     prediction = camera_to_world(prediction, R=rot, t=0)
 
     # We don't have the trajectory, but at least we can rebase the height
     prediction[:, :, 2] -= np.min(prediction[:, :, 2])
+
+    # -everything maya keys, computed here so the importer doesn't have to
+    if save_bundle:
+        posehelper.save_bundle(args.viz_output / "pose_bundle.npz",
+                               posehelper.preprocess(prediction))
     anim_output = {'Reconstruction': prediction}
     input_keypoints = image_coordinates(
         input_keypoints[..., :2], w=1000, h=1002)
@@ -224,37 +320,622 @@ def videpose_infer(args):
     print('total spend {:2f} second'.format(ckpt))
 
 
-def maya_process(data):
+def maya_process(data, chunk_size=4096, processes=None):
     """
     Generate maya usable array with rotations.
     Maya has a quirk, it will convert incoming roations from radians to degress which is a problem when
-    you supply degrees. So I'm converting the finished results into radians and bring them in form to key
-    them easly in maya.
+    you supply degrees. So the rotations stay in radians and come in form to key them easly in maya.
+    Long clips are processed in chunks over a process pool, see posehelper.preprocess.
+
+    Args:
+        data ([List/Array]): List or Array containing the calculated positional data from VideoPose, shape (N, 17, 3).
+        chunk_size (Int, optional): Frames per chunk. Defaults to 4096.
+        processes ([Int], optional): Pool size, 1 to stay in this process. Defaults to None, the number of cpus.
+
+    Returns:
+        [List]: List containing the first frame positions for every joint and the parent relative rotations,
+                per joint None or the X, Y and Z arrays over all frames.
+    """
+    bundle = posehelper.preprocess(data, chunk_size, processes)
+
+    positions = [bundle["positions"][0, i] for i in range(17)]
+    rotations = bundle["rotations"]
+    aimed = set(bundle["joints"].tolist())
+
+    rots_splits = [rotations[:, idx].T if idx in aimed else None for idx in range(17)]
+
+    return [positions, rots_splits]
+
+
+# --------------------------- Staged Pipeline ------------------------- #
+# --------------------------------------------------------------------- #
+
+
+class Stage(object):
+    """
+    Step of a pipeline, runs in it's own thread and keeps track of it's busy time.
+
+    Args:
+        name ([str]): Name used in the timing report.
+        func ([function]): Called with every incoming item, returns the item for the next stage
+                           or None to drop it. For the source stage a generator function without arguments.
+        finish ([function], optional): Called after the last item, a returned item
+                                       goes to the next stage. Defaults to None.
+    """
+
+    def __init__(self, name, func, finish=None):
+        self.name = name
+        self.func = func
+        self.finish = finish
+        self.busy = 0.0
+        self.items = 0
+
+
+_END = object()
+
+
+def run_pipeline(source, stages, queue_size=4):
+    """
+    Run a source and stages concurrently, connected by bounded queues.
+    A slow stage makes the ones before it wait instead of piling up chunks in memory.
+    The first error stops the processing, the remaining items get drained and the error is raised.
+
+    Args:
+        source ([Stage]): Stage whose func yields the items.
+        stages ([List]): Stages in order.
+        queue_size (int, optional): Items waiting between two stages. Defaults to 4.
+
+    Returns:
+        [float]: Wall time in seconds.
+    """
+    queues = [queue.Queue(maxsize=queue_size) for _ in stages]
+    errors = []
+
+    def timed(stage, func, *args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            stage.busy += time.perf_counter() - start
+
+    def feed():
+        try:
+            items = source.func()
+            while not errors:
+                try:
+                    item = timed(source, next, items)
+                except StopIteration:
+                    break
+                source.items += 1
+                queues[0].put(item)
+        except Exception as err:
+            errors.append(err)
+        queues[0].put(_END)
+
+    def work(stage, inq, outq):
+        while True:
+            item = inq.get()
+            if item is _END:
+                break
+            if errors:
+                continue
+
+            try:
+                res = timed(stage, stage.func, item)
+                stage.items += 1
+                if outq is not None and res is not None:
+                    outq.put(res)
+            except Exception as err:
+                errors.append(err)
+
+        if stage.finish is not None and not errors:
+            try:
+                res = timed(stage, stage.finish)
+                if outq is not None and res is not None:
+                    outq.put(res)
+            except Exception as err:
+                errors.append(err)
+
+        if outq is not None:
+            outq.put(_END)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=feed, daemon=True)]
+    for n, stage in enumerate(stages):
+        outq = queues[n + 1] if n + 1 < len(stages) else None
+        threads.append(threading.Thread(target=work, args=(stage, queues[n], outq), daemon=True))
+
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    if errors:
+        raise errors[0]
+    return time.perf_counter() - start
+
+
+def print_timings(stages, wall):
+    """
+    Print the busy time of every stage, the share shows how much of the wall time a stage was working.
+
+    Args:
+        stages ([List]): Stages including the source.
+        wall ([float]): Wall time in seconds.
+    """
+    print("{0:<10}{1:>8}{2:>10}{3:>8}".format("stage", "items", "busy", "share"))
+    for stage in stages:
+        print("{0:<10}{1:>8}{2:>8.2f} s{3:>7.0f}%".format(
+            stage.name, stage.items, stage.busy, 100.0 * stage.busy / wall if wall else 0.0))
+    print("{0:<10}{1:>8}{2:>8.2f} s  (sum of stages {3:.2f} s)".format(
+        "wall", "", wall, sum(s.busy for s in stages)))
+
+
+def _video_fps(path):
+    # -frame rate of the video, None if it can't be read
+    try:
+        import cv2
+    except ImportError:
+        return None
+
+    cap = cv2.VideoCapture(str(path))
+    fps = cap.get(cv2.CAP_PROP_FPS) if cap.isOpened() else 0.0
+    cap.release()
+    return fps or None
+
+
+def _symmetry():
+    from videopose import metadata
+
+    kps_left, kps_right = [list(k) for k in metadata['keypoints_symmetry']]
+    return kps_left, kps_right, [4, 5, 6, 11, 12, 13], [1, 2, 3, 14, 15, 16]
+
+
+# -loaded models and 2d detectors, keyed by what they were built from
+_modelCache = {}
+
+
+class KeypointBuffer(object):
+    """
+    Reusable float32 array for the normalized 2d keypoints, frames get appended window by
+    window as the detector delivers them. Only grows when a longer clip comes in, a warm
+    worker keeps one so clips don't allocate a fresh input array each.
+    """
+
+    def __init__(self, frames=0, joints=17):
+        self.array = np.empty((frames, joints, 2), dtype=np.float32)
+        self.length = 0
+
+    def clear(self):
+        self.length = 0
+
+    def append(self, keypoints):
+        """
+        Normalize and append the keypoints of the next frames.
+
+        Args:
+            keypoints ([np.ndarray]): Raw detector keypoints, shape (frames, joints, 2 or more).
+
+        Returns:
+            [np.ndarray]: View of all frames so far.
+        """
+        end = self.length + len(keypoints)
+        if len(self.array) < end or self.array.shape[1] != keypoints.shape[1]:
+            grown = np.empty((max(end, 2 * len(self.array)), keypoints.shape[1], 2), dtype=np.float32)
+            grown[:self.length] = self.array[:self.length]
+            self.array = grown
+
+        _normalize_into(keypoints, self.array[self.length:end])
+        self.length = end
+        return self.array[:end]
+
+
+def _normalize_into(keypoints, out, w=1000, h=1002):
+    # -same as common.camera.normalize_screen_coordinates, written into out
+    np.multiply(keypoints[..., :2], 2.0 / w, out=out, casting="unsafe")
+    out -= np.array([1, h / w], dtype=out.dtype)
+    return out
+
+
+def _get_detector(args):
+    import gene_npz
+
+    gene_npz.args.outputpath = str(args.viz_output / "alpha_pose_kunkun_cut")
+    key = ("detector_2d", args.detector_2d)
+    if key not in _modelCache:
+        _modelCache[key] = gene_npz.generate_kpts(args.detector_2d)
+    detector_2d = _modelCache[key]
+    assert detector_2d, 'detector_2d should be in ({alpha, hr, open}_pose)'
+    return detector_2d
+
+
+def _video_segments(path, window, folder):
+    """
+    Split a video into segments of window frames with cv2, written one at a time
+    so the detector can work on a segment while the next one gets cut.
+
+    Yields:
+        [Tuple]: Path of the segment and the number of frames in it.
+    """
+    import cv2
+
+    cap = cv2.VideoCapture(str(path))
+    fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
+    size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    fourcc = cv2.VideoWriter_fourcc(*"mp4v")
+
+    try:
+        for n in itertools.count():
+            seg = os.path.join(folder, "segment_{0:05d}.mp4".format(n))
+            writer = cv2.VideoWriter(seg, fourcc, fps, size)
+            count = 0
+            while count < window:
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                writer.write(frame)
+                count += 1
+            writer.release()
+
+            if not count:
+                os.remove(seg)
+                return
+            yield seg, count
+            os.remove(seg)
+    finally:
+        cap.release()
+
+
+def _detect_windows(args, window):
+    """
+    Raw 2d keypoints window by window. Videos are cut into segments and every segment goes
+    through the 2d detector on it's own, the first keypoints are ready long before the
+    whole video is detected. Without cv2 the detector gets the whole video at once.
+
+    Yields:
+        [np.ndarray]: Keypoints of the next frames, shape (frames, 17, 2 or more).
+    """
+    if args.input_npz:
+        keypoints = np.load(args.input_npz)['kpts']  # (N, 17, 2)
+        for start in range(0, len(keypoints), window):
+            yield keypoints[start:start + window]
+        return
+
+    detector_2d = _get_detector(args)
+    try:
+        import cv2  # noqa
+    except ImportError:
+        yield detector_2d(args.viz_video)
+        return
+
+    folder = tempfile.mkdtemp(prefix="aimocap_")
+    try:
+        for seg, count in _video_segments(args.viz_video, window, folder):
+            keypoints = detector_2d(seg)
+            if len(keypoints) != count:
+                raise RuntimeError("2d detector gave {0} frames for a segment of {1}".format(
+                    len(keypoints), count))
+            yield keypoints
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def get_model(args):
+    """
+    Cached _load_model, the checkpoint gets loaded once per process.
+
+    Args:
+        args ([arguments]): Arguments as given by _pose_args.
+
+    Returns:
+        [TemporalModel]: Model in eval mode.
+    """
+    key = (os.path.abspath(os.path.join(args.checkpoint, args.resume if args.resume else args.evaluate)),
+           args.causal, args.dropout, args.channels, args.dense)
+    if key not in _modelCache:
+        _modelCache[key] = _load_model(args)
+    return _modelCache[key]
+
+
+def _load_model(args):
+    from common.model import TemporalModel
+
+    model_pos = TemporalModel(17, 2, 17, filter_widths=[3, 3, 3, 3, 3], causal=args.causal, dropout=args.dropout,
+                              channels=args.channels, dense=args.dense)
+    if torch.cuda.is_available():
+        model_pos = model_pos.cuda()
+
+    chk_filename = os.path.join(
+        args.checkpoint, args.resume if args.resume else args.evaluate)
+    checkpoint = torch.load(chk_filename, map_location=lambda storage, loc: storage)
+    model_pos.load_state_dict(checkpoint['model_pos'])
+    model_pos.eval()
+
+    return model_pos
+
+
+def _lift_window(model_pos, keypoints, start, end, args):
+    """
+    Lift the frames start to end into 3d. The window gets the real neighbour frames of it's
+    receptive field as context, so the result matches lifting the whole clip at once.
+    """
+    from common.generators import UnchunkedGenerator
+    from common.utils import evaluate
+
+    pad = (model_pos.receptive_field() - 1) // 2
+    first = max(0, start - pad)
+    last = min(len(keypoints), end + pad)
+
+    kps_left, kps_right, joints_left, joints_right = _symmetry()
+    gen = UnchunkedGenerator(None, None, [keypoints[first:last]],
+                             pad=pad, causal_shift=0, augment=args.test_time_augmentation,
+                             kps_left=kps_left, kps_right=kps_right, joints_left=joints_left, joints_right=joints_right)
+    prediction = evaluate(gen, model_pos, return_predictions=True)
+
+    return prediction[start - first:end - first]
+
+
+def infer_pipeline(args, send=False, save_maya=False, window=1024, queue_size=4, model_pos=None, buffer=None):
+    """
+    Run the inference of a video as overlapping stages, 2d keypoints per window -> 3d lifting
+    -> world transform -> serialization -> sending/saving. The video is detected segment by
+    segment (see _detect_windows), a window gets lifted as soon as the keypoints of it's
+    receptive field are there, while the detector already works on the next segment.
+    The model loads while the first segment is detected.
+
+    Writes 'pose.pose' (see posehelper.write_pose) into args.viz_output, with the frame rate
+    of the video (none for .npz input, it isn't stored there), with save_maya also
+    'pose_bundle.npz' ready for maya, with send the chunks go to a running PoseMayaServer.
+    The height gets rebased on the lowest point of the whole clip, when sending on the one of
+    the first window, later windows can't change it as their frames may already be in maya.
+
+    Args:
+        args ([arguments]): Arguments as given by _pose_args.
+        send (bool, optional): Stream the result to maya. Defaults to False.
+        save_maya (bool, optional): Save a preprocessed bundle for maya. Defaults to False.
+        window (int, optional): Frames detected and lifted at once. Defaults to 1024.
+        queue_size (int, optional): Chunks waiting between two stages. Defaults to 4.
+        model_pos ([TemporalModel], optional): Already loaded model. Defaults to None, see get_model.
+        buffer ([KeypointBuffer], optional): Reused input buffer. Defaults to None, a new one.
+
+    Returns:
+        [np.ndarray]: World space prediction, shape (N, 17, 3).
+    """
+    from common.camera import camera_to_world
+
+    state = {"model": model_pos, "ground": None, "chunks": [], "sock": None, "lifted": 0}
+    buffer = buffer or KeypointBuffer()
+    buffer.clear()
+
+    # -the checkpoint loads while the 2d detector runs, lift waits for it
+    load_stage = Stage("model", None)
+    loader = None
+    if model_pos is None:
+        def load():
+            start = time.perf_counter()
+            try:
+                state["model"] = get_model(args)
+                load_stage.items = 1
+            finally:
+                load_stage.busy = time.perf_counter() - start
+
+        loader = threading.Thread(target=load, daemon=True)
+        loader.start()
+
+    def detect():
+        return _detect_windows(args, window)
+
+    def lift_ready(final):
+        # -lift every frame whose right context is complete, all of them after the last segment
+        if loader is not None:
+            loader.join()
+        if state["model"] is None:
+            raise RuntimeError("Loading the 3d model failed.")
+
+        keypoints = buffer.array[:buffer.length]
+        pad = (state["model"].receptive_field() - 1) // 2
+        ready = len(keypoints) if final else len(keypoints) - pad
+
+        start = state["lifted"]
+        if ready <= start:
+            return None
+        state["lifted"] = ready
+        return start, _lift_window(state["model"], keypoints, start, ready, args)
+
+    def lift(keypoints):
+        buffer.append(keypoints)
+        return lift_ready(False)
+
+    def lift_rest():
+        return lift_ready(True)
+
+    def world(item):
+        start, prediction = item
+        prediction = camera_to_world(prediction, R=np.asarray(static.VideoPoseCameraRotation, dtype=np.float32), t=0)
+
+        # We don't have the trajectory, but at least we can rebase the height
+        #   streamed frames can't wait for the whole clip, the others get rebased in save
+        if send:
+            if state["ground"] is None:
+                state["ground"] = np.min(prediction[:, :, 2])
+            prediction[:, :, 2] -= state["ground"]
+        return start, prediction
+
+    def collect(item):
+        state["chunks"].append(item[1])
+        return item
+
+    def save():
+        prediction = np.concatenate(state["chunks"]) if state["chunks"] else np.empty((0, 17, 3))
+        if not send and len(prediction):
+            prediction[:, :, 2] -= np.min(prediction[:, :, 2])
+        state["prediction"] = prediction
+        fps = None if args.input_npz else _video_fps(args.viz_video)
+        posehelper.write_pose(args.viz_output / "pose.pose", prediction, fps)
+        if save_maya:
+            posehelper.save_bundle(args.viz_output / "pose_bundle.npz",
+                                   posehelper.preprocess(prediction))
+
+    def encode(item):
+        start, prediction = item
+        message = _frame_message({"type": "chunk", "start": start, "frames": prediction})
+        if start == 0:
+            # -the length isn't known while the video is still being detected, it's only logged
+            message = _frame_message({"type": "begin", "frames": None}) + message
+        return message
+
+    def transmit(message):
+        if state["sock"] is None:
+            state["sock"] = socket.create_connection((static.HOST, static.PORT))
+        state["sock"].sendall(message)
+
+    def close():
+        sock = state["sock"] or socket.create_connection((static.HOST, static.PORT))
+        with sock:
+            if state["sock"] is None:
+                sock.sendall(_frame_message({"type": "begin", "frames": 0}))
+            sock.sendall(_frame_message({"type": "end"}))
+            reply = _read_message(sock)
+        if not reply.get("success"):
+            raise RuntimeError(reply.get("msg"))
+
+    source = Stage("detect", detect)
+    stages = [Stage("lift", lift, lift_rest), Stage("world", world), Stage("save", collect, save)]
+    if send:
+        stages += [Stage("encode", encode), Stage("send", transmit, close)]
+
+    wall = run_pipeline(source, stages, queue_size)
+    print_timings(([load_stage] if loader is not None else []) + [source] + stages, wall)
+
+    return state["prediction"]
+
+
+# --------------------------- Warm Worker ----------------------------- #
+# --------------------------------------------------------------------- #
+
+
+def submit_job(jobs_dir, path, output=None, save_maya=False):
+    """
+    Queue a clip for a running worker. The job file gets renamed into place,
+    a worker never sees a half written one.
 
     Args:
-        data ([List/Array]): List or Array containing the calculated positional data from VideoPose.
+        jobs_dir ([str]): Directory the worker watches.
+        path ([str]): Video or .npz file with 2d keypoints.
+        output ([str], optional): Output directory. Defaults to None, next to the input.
+        save_maya (bool, optional): Also write a pose_bundle.npz. Defaults to False.
 
     Returns:
-        [List]: List containing the positions for every joint and the calculated rotations for every frame.
+        [pathlib.Path]: The job file.
     """
-    positions = [data[1][i] for i in range(17)]
-    rotations = go_over_chain(data)
+    jobs_dir = pathlib.Path(jobs_dir)
+    path = pathlib.Path(path).resolve()
+    if output is None:
+        output = path.parent / path.stem
+
+    job = {"input": str(path), "output": str(pathlib.Path(output).resolve()), "save_maya": save_maya}
+    name = "{0}_{1}".format(int(time.time() * 1000), path.stem)
+
+    tmp = jobs_dir / (name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(job, f, indent=4)
+    os.replace(tmp, jobs_dir / (name + ".job"))
 
-    key_skips = (3, 6, 10, 13, 16)
+    return jobs_dir / (name + ".job")
 
-    rots_splits = []
-    for idx in range(17):
-        if idx in key_skips:
-            rots_splits.append(None)
+
+def _claim_job(jobs_dir):
+    # -rename is atomic, with several workers on one directory only one gets the job
+    for job in sorted(jobs_dir.glob("*.job")):
+        running = job.with_suffix(".run")
+        try:
+            os.replace(job, running)
+        except OSError:
             continue
+        return running
 
-        idx_rots = rotations[:, idx]
 
-        # -split array to convert it coloum-wise into radians, maya converts it automatically
-        rots_split = array_radians(np.split(idx_rots, 3, axis=1))
-        rots_splits.append(rots_split)
+def run_worker(args, jobs_dir, poll=1.0, max_jobs=None, window=1024, queue_size=4):
+    """
+    Persistent inference worker, loads the model once and processes the '.job' files
+    (see submit_job) of jobs_dir in order. Every clip gets lifted with infer_pipeline,
+    the result is written as 'pose.pose' into the output directory of the job.
 
-    return [positions, rots_splits]
+    A finished job is renamed to '.done' with the result added, a failed one to '.failed'
+    with the error. A 'stop' file in jobs_dir ends the worker. The logged clips/minute only
+    count finished clips, over the time spent on all jobs.
+
+    Args:
+        args ([arguments]): Arguments as given by _pose_args.
+        jobs_dir ([str]): Directory to watch.
+        poll (float, optional): Seconds to wait when there is no job. Defaults to 1.0.
+        max_jobs ([int], optional): Stop after this many jobs. Defaults to None, run till stopped.
+        window (int, optional): Frames lifted at once. Defaults to 1024.
+        queue_size (int, optional): Chunks waiting between two stages. Defaults to 4.
+
+    Returns:
+        [int]: Number of processed jobs.
+    """
+    jobs_dir = pathlib.Path(jobs_dir)
+    jobs_dir.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    model_pos = get_model(args)
+    buffer = KeypointBuffer()
+    print("[LOG] Model loaded in {0:.2f} s, watching {1}".format(time.perf_counter() - start, jobs_dir))
+
+    processed = 0
+    done = 0
+    busy = 0.0
+    while max_jobs is None or processed < max_jobs:
+        stop = jobs_dir / "stop"
+        if stop.exists():
+            stop.unlink()
+            break
+
+        running = _claim_job(jobs_dir)
+        if running is None:
+            time.sleep(poll)
+            continue
+
+        with open(running, "r", encoding="utf-8") as f:
+            job = json.load(f)
+
+        job_args = copy.copy(args)
+        job_args.viz_output = pathlib.Path(job["output"])
+        job_args.viz_output.mkdir(parents=True, exist_ok=True)
+        if job["input"].endswith(".npz"):
+            job_args.input_npz = job["input"]
+        else:
+            job_args.input_npz = ""
+            job_args.viz_video = job["input"]
+
+        clip_start = time.perf_counter()
+        try:
+            prediction = infer_pipeline(job_args, save_maya=job.get("save_maya", False), window=window,
+                                        queue_size=queue_size, model_pos=model_pos, buffer=buffer)
+        except Exception as err:
+            job["error"] = "{0}: {1}".format(type(err).__name__, err)
+            suffix = ".failed"
+        else:
+            job["pose"] = str(job_args.viz_output / "pose.pose")
+            job["frames"] = len(prediction)
+            suffix = ".done"
+            done += 1
+
+        # -failed jobs cost time but don't count as clips
+        job["seconds"] = time.perf_counter() - clip_start
+        busy += job["seconds"]
+        processed += 1
+
+        with open(running, "w", encoding="utf-8") as f:
+            json.dump(job, f, indent=4)
+        os.replace(running, running.with_suffix(suffix))
+
+        print("[LOG] {0} {1} in {2:.2f} s, {3:.1f} clips/minute".format(
+            running.stem, suffix[1:], job["seconds"], 60.0 * done / busy if busy else 0.0))
+
+    return processed
 
 
 def cli():
@@ -284,7 +965,12 @@ def cli():
     sys.argv = sys.argv[:1]
     # pprint(sys.path)
 
-    videpose_infer(pose_args)
+    if args.worker:
+        run_worker(pose_args, args.input, window=args.window, queue_size=args.queue)
+        return
+
+    infer_pipeline(pose_args, send=args.send_maya, save_maya=args.save_maya,
+                   window=args.window, queue_size=args.queue)
 
     # with open(outpath, 'w', encoding='utf-8') as f:
     # json.dump(ret, f, ensure_ascii=False,indent = 4, cls = NumpyEncoder)
@@ -0,0 +1,441 @@
+import maya.api.OpenMayaAnim as api2a
+import maya.api.OpenMaya as api2
+import maya.cmds as cmds
+import numpy as np
+import hashlib
+
+
+# --------------------------- Curve Reading --------------------------- #
+# --------------------------------------------------------------------- #
+
+
+class CurveData(object):
+    """
+    Keys of a single animation curve as NumPy arrays.
+    Times are in frames (or the raw input for driven keys), values in ui units,
+    the same numbers cmds.keyframe(q=True, tc=True, vc=True) would give.
+
+    Args:
+        name ([Str]): Name of the animation curve.
+        times ([np.ndarray]): Float64 array with the key times.
+        values ([np.ndarray]): Float64 array with the key values.
+        scale (Float, optional): Factor which converts the internal values into ui units. Defaults to 1.0.
+        kind (Str, optional): Kind of the curve output, one of 'linear', 'angular', 'time', 'unitless'.
+                              Defaults to 'unitless'.
+    """
+
+    def __init__(self, name, times, values, scale=1.0, kind="unitless"):
+        self.name = name
+        self.times = times
+        self.values = values
+        self.scale = scale
+        self.kind = kind
+
+    def __len__(self):
+        return len(self.times)
+
+    def __str__(self):
+        return "{0}: {1} keys".format(self.name, len(self))
+
+
+def list_anim_curves(nodes):
+    """
+    Get all animation curves driving the given nodes, with one listConnections call.
+
+    Args:
+        nodes ([Str,List]): Name of the node or list of names.
+
+    Returns:
+        [List]: Unique curve names in order of appearance.
+    """
+    if not nodes:
+        return []
+
+    anims = cmds.listConnections(nodes, s=True, d=False, t="animCurve") or []
+
+    seen = set()
+    return [a for a in anims if not (a in seen or seen.add(a))]
+
+
+def get_animFn(curve):
+    """
+    Get the function set of an animation curve by name.
+
+    Args:
+        curve ([Str]): Name of the animation curve.
+
+    Returns:
+        [MFnAnimCurve]: Function set attached to the curve.
+    """
+    mobj = api2.MSelectionList().add(curve).getDependNode(0)
+    return api2a.MFnAnimCurve(mobj)
+
+
+def curve_kind(animfn):
+    """
+    Get the kind of value a curve outputs, translate channels are 'linear',
+    rotate channels 'angular'.
+
+    Args:
+        animfn ([MFnAnimCurve]): Function set of the curve.
+
+    Returns:
+        [Str]: One of 'linear', 'angular', 'time', 'unitless'.
+    """
+    return _curveKinds.get(animfn.animCurveType, "unitless")
+
+
+def ui_scale(animfn, kind=None):
+    """
+    Factor which converts the internal values of a curve into ui units.
+    Angular curves are stored in radians and linear ones in centimeters.
+
+    Args:
+        animfn ([MFnAnimCurve]): Function set of the curve.
+        kind ([Str], optional): Kind of the curve if already known. Defaults to None, looked up.
+
+    Returns:
+        [Float]: Conversion factor.
+    """
+    kind = kind or curve_kind(animfn)
+
+    if kind == "angular":
+        return api2.MAngle(1.0, api2.MAngle.kRadians).asUnits(api2.MAngle.uiUnit())
+
+    if kind == "linear":
+        return api2.MDistance(1.0, api2.MDistance.kCentimeters).asUnits(api2.MDistance.uiUnit())
+
+    return 1.0
+
+
+def read_curve(curve):
+    """
+    Read all keys of an animation curve into arrays.
+    Times and values come from one bulk keyframe query each, the function set
+    is only used for the curve type and unit lookup. MFnAnimCurve has no bulk getter,
+    reading through it costs two or three API calls per key, the two queries
+    build their lists in C++ and stay at a fixed number of calls per curve.
+
+    Args:
+        curve ([Str]): Name of the animation curve.
+
+    Returns:
+        [CurveData]: The keys of the curve.
+    """
+    animfn = get_animFn(curve)
+    kind = curve_kind(animfn)
+
+    # -driven keys have a float input instead of a time
+    if animfn.isUnitlessInput:
+        times = cmds.keyframe(curve, q=True, fc=True)
+    else:
+        times = cmds.keyframe(curve, q=True, tc=True)
+    values = cmds.keyframe(curve, q=True, vc=True)
+
+    return CurveData(curve, np.asarray(times or [], dtype=np.float64),
+                     np.asarray(values or [], dtype=np.float64),
+                     ui_scale(animfn, kind), kind)
+
+
+def read_curves(curves):
+    """
+    Read the keys of many animation curves, two keyframe queries per curve.
+
+    Args:
+        curves ([List]): Names of the animation curves.
+
+    Returns:
+        [List]: CurveData for every given curve.
+    """
+    return [read_curve(c) for c in curves]
+
+
+def read_node_curves(nodes):
+    """
+    Convenient wrapper, read every animation curve driving the given nodes.
+
+    Args:
+        nodes ([Str,List]): Name of the node or list of names.
+
+    Returns:
+        [List]: CurveData for every found curve.
+    """
+    return read_curves(list_anim_curves(nodes))
+
+
+def output_attributes(animfn):
+    """
+    Long names of the attributes a curve drives, compound parents follow their child,
+    like ['translateX', 'translate'].
+
+    Args:
+        animfn ([MFnAnimCurve]): Function set of the curve.
+
+    Returns:
+        [List]: Attribute names, empty if the curve drives nothing.
+    """
+    names = []
+    for plug in animfn.findPlug("output", False).destinations():
+        names.append(plug.partialName(useLongNames=True))
+        if plug.isChild:
+            names.append(plug.parent().partialName(useLongNames=True))
+
+    return names
+
+
+def list_hierarchy_curves(top_parent):
+    """
+    Get all animation curves driving the given node and all of it's descendants.
+
+    Args:
+        top_parent ([Str]): Name of the top most node.
+
+    Returns:
+        [List]: Unique curve names.
+    """
+    nodes = cmds.listRelatives(top_parent, ad=True, f=True) or []
+    nodes.append(top_parent)
+
+    return list_anim_curves(nodes)
+
+
+# ------------------------- Curve Statistics -------------------------- #
+# --------------------------------------------------------------------- #
+
+
+class CurveStats(object):
+    """
+    Summary of the keys of a single animation curve, values in ui units.
+
+    Args:
+        data ([CurveData]): The keys of the curve.
+    """
+
+    def __init__(self, data):
+        values = data.values
+        self.name = data.name
+        self.count = len(values)
+        self.min = float(values.min()) if self.count else None
+        self.max = float(values.max()) if self.count else None
+        self.isStatic = bool(self.count) and self.min == self.max
+        self.hash = hashlib.sha1(data.times.tobytes() + values.tobytes()).hexdigest()
+
+    def __str__(self):
+        return "{0}: {1} keys, [{2}, {3}]".format(self.name, self.count, self.min, self.max)
+
+
+class CurveStatsCache(object):
+    """
+    Keeps a CurveStats per curve, computed on first request and reused till the curve changes.
+    Entries are keyed by the curve node, not it's name, so renames don't matter.
+    Attribute sets on a curve drop it's entry through MNodeMessage callbacks, key edits
+    made by commands through an MAnimMessage callback, deleted curves drop out the same way.
+    Call clear() to remove all callbacks.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._editedCB = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, curve):
+        """
+        Get the statistics of a curve, reads the curve only if there is no valid entry.
+
+        Args:
+            curve ([Str]): Name of the animation curve.
+
+        Returns:
+            [CurveStats]: The statistics of the curve.
+        """
+        mobj = api2.MSelectionList().add(curve).getDependNode(0)
+        key = api2.MObjectHandle(mobj).hashCode()
+
+        entry = self._entries.get(key)
+        if entry is not None and entry[0].isValid():
+            entry[1].name = curve
+            return entry[1]
+
+        stats = CurveStats(read_curve(curve))
+        cbs = [
+            api2.MNodeMessage.addAttributeChangedCallback(mobj, self._changed, key),
+            api2.MNodeMessage.addNodePreRemovalCallback(mobj, self._removed, key),
+        ]
+        self._drop(key)
+        self._entries[key] = (api2.MObjectHandle(mobj), stats, cbs)
+
+        if self._editedCB is None:
+            self._editedCB = api2a.MAnimMessage.addAnimCurveEditedCallback(self._edited)
+
+        return stats
+
+    def get_many(self, curves):
+        """
+        Get the statistics of many curves.
+
+        Args:
+            curves ([List]): Names of the animation curves.
+
+        Returns:
+            [List]: CurveStats for every given curve.
+        """
+        return [self.get(c) for c in curves]
+
+    def invalidate(self, curve):
+        """
+        Drop the entry of a curve, for edits which don't trigger a callback.
+
+        Args:
+            curve ([Str]): Name of the animation curve.
+        """
+        mobj = api2.MSelectionList().add(curve).getDependNode(0)
+        self._drop(api2.MObjectHandle(mobj).hashCode())
+
+    def clear(self):
+        """
+        Drop all entries and remove their callbacks.
+        """
+        for key in list(self._entries):
+            self._drop(key)
+
+        if self._editedCB is not None:
+            api2.MMessage.removeCallback(self._editedCB)
+            self._editedCB = None
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            api2.MMessage.removeCallbacks(entry[2])
+
+    def _changed(self, msg, plug, other_plug, key):
+        # -only sets and array element changes, evaluations and connections leave the keys alone
+        if msg & (api2.MNodeMessage.kAttributeSet |
+                  api2.MNodeMessage.kAttributeArrayAdded |
+                  api2.MNodeMessage.kAttributeArrayRemoved):
+            self._drop(key)
+
+    def _edited(self, curves, *args):
+        for n in range(len(curves)):
+            self._drop(api2.MObjectHandle(curves[n]).hashCode())
+
+    def _removed(self, node, key):
+        self._drop(key)
+
+
+#   Shared Statistics Cache
+_statsCache = CurveStatsCache()
+
+
+def curve_stats(curves):
+    """
+    Get the statistics of many curves through the shared cache.
+
+    Args:
+        curves ([List]): Names of the animation curves.
+
+    Returns:
+        [List]: CurveStats for every given curve.
+    """
+    return _statsCache.get_many(curves)
+
+
+# --------------------------- Curve Editing --------------------------- #
+# --------------------------------------------------------------------- #
+
+
+def cut_ranges(curve, ranges):
+    """
+    Remove all keys inside the given time ranges with a single, undoable cutKey.
+
+    Args:
+        curve ([Str]): Name of the animation curve.
+        ranges ([List]): Pairs of (start time, end time), both inclusive.
+    """
+    if ranges:
+        cmds.cutKey(curve, time=[tuple(r) for r in ranges],
+                    option="keys", clear=True)
+
+
+def write_curve(data, times, values, tangent=api2a.MFnAnimCurve.kTangentLinear, change=None):
+    """
+    Replace all keys of a curve with the given ones in a single addKeys call.
+    data.times has to match the current keys of the curve.
+    API edits aren't part of maya's undo queue, pass a MAnimCurveChange to be able
+    to revert them with change.undoIt().
+
+    Args:
+        data ([CurveData]): Curve as given by read_curve, used for the name and units.
+        times ([np.ndarray, List]): New key times, in the same units as data.times.
+        values ([np.ndarray, List]): New key values, in ui units like data.values.
+        tangent (Int, optional): In and out tangent type of the new keys. Defaults to kTangentLinear.
+        change ([MAnimCurveChange], optional): Records the edit for undo. Defaults to None.
+    """
+    animfn = get_animFn(data.name)
+
+    times = np.asarray(times, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    if data.scale != 1.0:
+        values = values / data.scale
+
+    if animfn.isUnitlessInput:
+        inputs = api2.MDoubleArray(times.tolist())
+    else:
+        unit = api2.MTime.uiUnit()
+        inputs = api2.MTimeArray([api2.MTime(t, unit) for t in times.tolist()])
+
+    # -addKeys already replaces the old keys in the range of the new ones,
+    #   only the ones outside of it get removed (none for reduce_indices results)
+    if len(times):
+        outside = np.flatnonzero((data.times < times.min()) | (data.times > times.max()))
+    else:
+        outside = np.arange(animfn.numKeys)
+    for i in reversed(outside.tolist()):
+        animfn.remove(i, change)
+
+    animfn.addKeys(inputs, api2.MDoubleArray(values.tolist()),
+                   tangent, tangent, False, change)
+
+    _statsCache.invalidate(data.name)
+
+
+def set_values(data, values, change=None):
+    """
+    Set the values of all keys of a curve, times and tangent types stay untouched.
+    API edits aren't part of maya's undo queue, pass a MAnimCurveChange to be able
+    to revert them with change.undoIt().
+
+    Args:
+        data ([CurveData]): Curve as given by read_curve, used for the name and units.
+        values ([np.ndarray, List]): New key values in ui units, one per key.
+        change ([MAnimCurveChange], optional): Records the edit for undo. Defaults to None.
+    """
+    animfn = get_animFn(data.name)
+
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) != animfn.numKeys:
+        raise ValueError("{0} has {1} keys, got {2} values".format(
+            data.name, animfn.numKeys, len(values)))
+
+    if data.scale != 1.0:
+        values = values / data.scale
+
+    for i, val in enumerate(values.tolist()):
+        animfn.setValue(i, val, change)
+
+    _statsCache.invalidate(data.name)
+
+
+#   Curve Type Switch-Case
+# -kind of output for every anim curve type
+_curveKinds = {
+    api2a.MFnAnimCurve.kAnimCurveTA: "angular",
+    api2a.MFnAnimCurve.kAnimCurveUA: "angular",
+    api2a.MFnAnimCurve.kAnimCurveTL: "linear",
+    api2a.MFnAnimCurve.kAnimCurveUL: "linear",
+    api2a.MFnAnimCurve.kAnimCurveTT: "time",
+    api2a.MFnAnimCurve.kAnimCurveUT: "time",
+    api2a.MFnAnimCurve.kAnimCurveTU: "unitless",
+    api2a.MFnAnimCurve.kAnimCurveUU: "unitless",
+}
@@ -13,6 +13,8 @@ class _BaseSequence(object):
     def _index_check(self, index):
         """
         Check if the given index or slice is valid.
+        Slices follow the builtin semantics and are only rejected for a zero step,
+        out of range start/stop values get clamped like in lists.
 
         Args:
             index ([int, slice]): Given indecies.
@@ -21,10 +23,8 @@ class _BaseSequence(object):
             [string, None]: Returns a error message if index is invalid else None.
         """
         if isinstance(index, slice):
-            if (abs(index.start) > len(self) - 1 or abs(index.stop)) > len(self)-1 or \
-                    index.start > index.stop:
-                msg = "Slice indices out of range.\n{0} : {1}".format(
-                    index.start, index.stop)
+            if index.step == 0:
+                msg = "Slice step cannot be zero."
             else:
                 return None
         elif not isinstance(index, int):
@@ -41,6 +41,7 @@ class _BaseSequence(object):
     def _negativeIndices(self, indices):
         """
         Checks for negative indices in a slice or int and returns the positive values.
+        Slices get resolved against the sequence length, the same way builtin sequences do.
 
         Args:
             indices ([slice, int]): Slice object containing the indices or int of a single index.
@@ -49,16 +50,7 @@ class _BaseSequence(object):
             [slice, int]: Slice with the new indices or positive int index.
         """
         try:
-            st_idx = indices.start
-            end_idx = indices.stop
-
-            if indices.start < 0:
-                st_idx = len(self) - abs(indices.start)
-
-            if indices.stop < 0:
-                end_idx = len(self) - abs(indices.stop)
-
-            return slice(st_idx, end_idx)
+            return slice(*indices.indices(len(self)))
 
         except AttributeError:
             if indices < 0:
@@ -66,18 +58,46 @@ class _BaseSequence(object):
 
             return indices
 
+    @staticmethod
+    def _sliceLength(indices):
+        """
+        Number of items a resolved slice, as given by _negativeIndices, will touch.
+
+        Args:
+            indices ([slice]): Slice with positive start, stop and non-zero step.
+
+        Returns:
+            [int]: Number of items in the slice.
+        """
+        start, stop, step = indices.start, indices.stop, indices.step
+
+        if step > 0 and start < stop:
+            return (stop - start - 1) // step + 1
+        if step < 0 and start > stop:
+            return (start - stop - 1) // -step + 1
+        return 0
+
 
 class Array(_BaseSequence):
     """
     Simple Array class, implimenting the ctypes.py_object.
     Used for lists where the given number of items aren't changing.
 
+    Slicing an array returns a view, a new Array which shares the backing buffer
+    with the array it was sliced from, described by an offset and stride into that buffer.
+    No element gets copied and writing to the view writes to the original.
+
     Args:
         size ([int, iterable]): Can either be a number from which the size of the array will be determined
                                 or a iterable from which the array will be build.
     """
 
     def __init__(self, size):
+        # -position of the first item and step between items in the backing buffer,
+        #   only differs from the defaults for views
+        self._offset = 0
+        self._stride = 1
+
         if not isinstance(size, int):
             try:
                 # -test if item is iterable else raise error
@@ -99,7 +119,7 @@ class Array(_BaseSequence):
 
     def __str__(self):
         msg = "[{0}]".format(
-            ", ".join([str(self._elements[i]) for i in range(len(self))]))
+            ", ".join([str(item) for item in self._arrayGenerator()]))
         return msg
 
     # -----------------------------Sequence Dunders------------------------------ #
@@ -125,52 +145,112 @@ class Array(_BaseSequence):
     def __getitem__(self, index):
         """
         Return the item at a given index in the array.
+        When given a slice, return a view which shares the elements with this array.
 
         Args:
-            index ([Int]): Index.
+            index ([int, slice]): Index.
 
         Raises:
-            ValueError: If index is smaller/equals 0 or bigger than the array size.
+            IndexError: If index is out of range or the slice step is 0.
 
         Returns:
-            [type]: Object held at the given index.
+            [type, Array]: Object held at the given index or view of the sliced items.
         """
-
         res = self._index_check(index)
         if res:
             raise IndexError(res)
 
-        return self._elements[index]
+        if isinstance(index, slice):
+            return self._view(self._negativeIndices(index))
+
+        return self._elements[self._bufferIndex(self._negativeIndices(index))]
 
     def __setitem__(self, index, value):
         """
         Set the item at a given index in the array.
+        When given a slice, the value has to be an iterable with as many items as the slice.
 
         Args:
-            index ([Int]): Index.
+            index ([int, slice]): Index.
             value ([type]): Object that should be assigned.
 
         Raises:
-            ValueError: If index is smaller/equals 0 or bigger than the array size.
+            IndexError: If index is out of range or the slice step is 0.
+            ValueError: If the number of given values doesn't match the slice.
         """
         res = self._index_check(index)
         if res:
             raise IndexError(res)
 
-        self._elements[index] = value
+        if not isinstance(index, slice):
+            self._elements[self._bufferIndex(self._negativeIndices(index))] = value
+            return
+
+        index = self._negativeIndices(index)
+        length = self._sliceLength(index)
+
+        if not hasattr(value, "__len__"):
+            value = list(value)
+        if len(value) != length:
+            raise ValueError("Array slice assignment needs {0} values, got {1}.".format(
+                length, len(value)))
+
+        if not length:
+            return
+
+        # -translate the slice into the backing buffer and assign it in one go
+        first = self._bufferIndex(index.start)
+        step = index.step * self._stride
+        last = first + (length - 1) * step
+
+        if step > 0:
+            self._elements[first:last+1:step] = value
+        elif last > 0:
+            self._elements[first:last-1:step] = value
+        else:
+            # -a negative stride down to the very first element can't be expressed with a stop
+            self._elements[last:first+1:-step] = value[::-1]
 
     # ----------------------------------Helpers---------------------------------- #
 
     def clear(self, value=None):
         """
-        Clear each element of the array by looping over it 
-        and assigning the given value.
+        Clear each element of the array by assigning the given value.
+        All slots get filled in one slice assignment on the backing buffer, memset-style.
 
         Args:
             value ([type], optional): Value or Object which should be assigned. Defaults to None.
         """
-        for i in range(len(self)):
-            self._elements[i] = value
+        self[:] = [value] * len(self)
+
+    def _bufferIndex(self, index):
+        """
+        Translate a positive index of this array into the index of the backing buffer.
+
+        Args:
+            index ([int]): Positive index.
+
+        Returns:
+            [int]: Index into self._elements.
+        """
+        return self._offset + index * self._stride
+
+    def _view(self, indices):
+        """
+        Create a new array sharing the backing buffer of this one.
+
+        Args:
+            indices ([slice]): Resolved slice, as given by _negativeIndices.
+
+        Returns:
+            [Array]: The view on the sliced items.
+        """
+        view = Array.__new__(Array)
+        view._elements = self._elements
+        view._size = self._sliceLength(indices)
+        view._offset = self._bufferIndex(indices.start)
+        view._stride = self._stride * indices.step
+        return view
 
     def _arrayGenerator(self):
         """
@@ -180,10 +260,12 @@ class Array(_BaseSequence):
         Yields:
             [type]: The Object at a given index.
         """
-        curIdx = 0
-        while curIdx < len(self._elements):
-            yield self._elements[curIdx]
-            curIdx += 1
+        elements = self._elements
+        curIdx = self._offset
+        stride = self._stride
+        for _ in range(len(self)):
+            yield elements[curIdx]
+            curIdx += stride
 
     def _buildArray(self):
         """
@@ -197,6 +279,8 @@ class Array(_BaseSequence):
     def _fromIter(self, iterable):
         """
         Initialize array with elements from a given iterable.
+        Sequences get copied in one slice assignment, other iterables are
+        unpacked into a tuple or list first.
 
         Args:
             iterable ([type]): An object that can be traversed.
@@ -205,16 +289,21 @@ class Array(_BaseSequence):
             # -check for len of the iterable
             self._size = len(iterable)
         except TypeError:
-            # -if generator -> initialize LinkedList to get len
-            iterable = LinkedList(iterable)
+            # -if generator -> drain it into a list, which grows its buffer in chunks
+            #   at C speed, every slot of the ctypes array is only written once
+            iterable = list(iterable)
             self._size = len(iterable)
 
+        # -only builtin sequences are guaranteed to have a cheap __getitem__,
+        #   everything else (sets, dicts, LinkedLists) gets unpacked in one go
+        if not isinstance(iterable, (list, tuple)):
+            iterable = tuple(iterable)
+
         # -build array
         self._buildArray()
 
         # -initialize each element
-        for i, obj in enumerate(iterable):
-            self._elements[i] = obj
+        self._elements[0:self._size] = iterable
 
 
 class LinkedList(_BaseSequence):
@@ -232,17 +321,27 @@ class LinkedList(_BaseSequence):
             Defaults to None.
 
             E.g.: 'while sorting(curNode.data, addedData): ...
+        indexed([bool, optional]):
+            Keep a hash index (value -> nodes holding it) next to the chain,
+            turns the list into an ordered multiset. Membership tests and removal by value
+            become O(1), iteration order stays the same. Items have to be hashable.
+            Defaults to False.
     """
 
-    def __init__(self, source=None, sorting=None):
+    def __init__(self, source=None, sorting=None, indexed=False):
         self._head = None
         self._tail = None
         self._size = 0
+        # -value -> nodes holding it, in list order
+        self._index = {} if indexed else None
 
         self.append = self._sortAppend if sorting else self._append
         self._search = self._sortedSearch if sorting else self._unsortedSearch
         self.sorting = sorting
 
+        if indexed:
+            self._search = self._indexedSearch
+
         if source:
             self._fromIter(source)
 
@@ -292,90 +391,64 @@ class LinkedList(_BaseSequence):
     def __getitem__(self, index):
         """
         Return the item at a given index in the list.
+        When given a slice, return a new list with the sliced items.
 
         Args:
             index ([int, slice]): Index.
 
         Raises:
-            ValueError: If index is smaller/equals 0 or bigger than the list size.
+            IndexError: If index is out of range or the slice step is 0.
 
         Returns:
-            [type]: Object held at the given index.
+            [type, LinkedList]: Object held at the given index or list of the sliced items.
         """
         res = self._index_check(index)
         if res:
             raise IndexError(res)
 
-        # -assign a counter and load the first object in the list
-        i = 0
-        curNode = self._head
-
         # -check for int or slice
         if isinstance(index, int):
             # -check for negative index, calculate the positive
-            if index < 0:
-                index = len(self) - abs(index)
-
-            # -iterate over the nodes by comparing the indices
-            while i != index:
-                curNode = curNode.next
-                i += 1
-            # -save the stored data and return it
-            result = curNode.data
-        else:
-            # -check negative indices, calculate the postive ones
-            index = self._negativeSlices(index)
+            #   and save the stored data of the found node
+            return self._nodeAt(self._negativeIndices(index)).data
 
-            # -create new list and return it
-            result = LinkedList()
-
-            # -iterate over the nodes by comparing the index to the end index
-            while i <= index.stop:
-                # -check if index is bigger/equals the start index
-                if i >= index.start:
-                    result.append(curNode.data)
-                curNode = curNode.next
-                i += 1
+        # -create new list and fill it with the nodes data
+        result = LinkedList()
+        for node in self._sliceNodes(self._negativeIndices(index)):
+            result._append(node.data)
 
         return result
 
     def __setitem__(self, index, value):
         """
         Set the item at a given index in the list.
+        When given a slice, the value has to be an iterable with as many items as the slice.
 
         Args:
             index ([int, slice]): Index.
             value ([type]): Object that should be assigned.
 
         Raises:
-            ValueError: If index is smaller/equals 0 or bigger than the list size.
+            IndexError: If index is out of range or the slice step is 0.
+            ValueError: If the number of given values doesn't match the slice.
         """
         res = self._index_check(index)
         if res:
             raise IndexError(res)
 
-        i = 0
-        curNode = self._head
-
         if isinstance(index, int):
-            if index < 0:
-                index = (len(self)-1) - abs(index)
-            while i != index:
-                curNode = curNode.next
-                i += 1
-            curNode.data = value
-        else:
-            index = self._negativeSlices(index)
+            self._setData(self._nodeAt(self._negativeIndices(index)), value)
+            return
 
-            if len(value) != (index.stop - index.start):
-                raise ValueError("Not enough values given.")
+        index = self._negativeIndices(index)
 
-            valIter = iter(value)
-            while i <= index.stop:
-                if i >= index.start:
-                    curNode.data = next(valIter, None)
-                curNode = curNode.next
-                i += 1
+        if not hasattr(value, "__len__"):
+            value = list(value)
+        if len(value) != self._sliceLength(index):
+            raise ValueError("Not enough values given.")
+
+        for node, val in zip(self._sliceNodes(index), value):
+            self._setData(node, val)
 
     # -----------------------------------Methods--------------------------------- #
 
@@ -388,7 +461,7 @@ class LinkedList(_BaseSequence):
             item ([type]): Object which should be added.
         """
         # -create a list node and assign the item
-        newNode = _LinkedNode(item)
+        newNode = _LinkedNode(item, prevItem=self._tail)
 
         # -check if head is empty, assign new node as head
         #   else assign new node as next on the current tail
@@ -401,6 +474,9 @@ class LinkedList(_BaseSequence):
         self._tail = newNode
         self._size += 1
 
+        if self._index is not None:
+            self._index.setdefault(item, []).append(newNode)
+
     def _sortAppend(self, item):
         """
         Sorted append, slower version through list traversel.
@@ -419,7 +495,7 @@ class LinkedList(_BaseSequence):
             curNode = curNode.next
 
         # -create new node with item assigned
-        newNode = _LinkedNode(item)
+        newNode = _LinkedNode(item, prevItem=predNode)
         # -assign the current node as the next in the chain
         newNode.next = curNode
         self._size += 1
@@ -431,6 +507,16 @@ class LinkedList(_BaseSequence):
         else:
             predNode.next = newNode
 
+        # -if the chain was exhausted the new node is the tail
+        #   else it's the predecessor of the current node
+        if curNode is None:
+            self._tail = newNode
+        else:
+            curNode.prev = newNode
+
+        if self._index is not None:
+            self._indexInsert(newNode)
+
     def _unsortedSearch(self, target):
         """
         Compare items till list is exhausted or match found.
@@ -442,6 +528,12 @@ class LinkedList(_BaseSequence):
             curNode = curNode.next
         return curNode is not None
 
+    def _indexedSearch(self, target):
+        """
+        Look the target up in the hash index.
+        """
+        return target in self._index
+
     def _sortedSearch(self, target):
         """
         Compare items till list is exhausted or 
@@ -477,8 +569,14 @@ class LinkedList(_BaseSequence):
             predNode.next = curNode.next
 
         # -if current node is tail predecessor node will be tail
+        #   else link the next node back to the predecessor
         if curNode is self._tail:
             self._tail = predNode
+        else:
+            curNode.next.prev = predNode
+
+        if self._index is not None:
+            self._indexDiscard(curNode)
 
         return curNode.data
 
@@ -495,6 +593,17 @@ class LinkedList(_BaseSequence):
         Returns:
             [type]: Removed object.
         """
+        if self._index is not None:
+            # -first node holding the item, the index keeps them in list order
+            try:
+                curNode = self._index[item][0]
+            except KeyError:
+                raise ValueError(
+                    "LinkedList.remove({0}): {0} not in list".format(item))
+
+            self._size -= 1
+            return self._removal(curNode.prev, curNode)
+
         # -create a predecessor node and assign the head as current node
         predNode = None
         curNode = self._head
@@ -530,6 +639,11 @@ class LinkedList(_BaseSequence):
 
         index = self._negativeIndices(index)
 
+        # -the last node is known, no need to walk the chain
+        if index == len(self) - 1:
+            self._size -= 1
+            return self._removal(self._tail.prev, self._tail)
+
         # -create a predecessor node and assign the head as current node
         predNode = None
         curNode = self._head
@@ -559,6 +673,112 @@ class LinkedList(_BaseSequence):
             yield curNode.data
             curNode = curNode.next
 
+    def _setData(self, node, value):
+        """
+        Replace the data of a node and keep the hash index in sync.
+
+        Args:
+            node ([_LinkedNode]): Node which should be changed.
+            value ([type]): New object.
+        """
+        if self._index is None:
+            node.data = value
+            return
+
+        self._indexDiscard(node)
+        node.data = value
+        self._indexInsert(node)
+
+    def _indexInsert(self, node):
+        """
+        Register a linked node in the hash index, at it's position in the list order
+        relative to the other nodes holding the same value.
+
+        Args:
+            node ([_LinkedNode]): Node which is already linked into the chain.
+        """
+        handles = self._index.setdefault(node.data, [])
+        if not handles:
+            handles.append(node)
+            return
+
+        # -walk backwards till a node with the same value is found,
+        #   the new node goes right after it or in front of all others
+        predNode = node.prev
+        while predNode is not None:
+            if predNode.data == node.data:
+                for n, handle in enumerate(handles):
+                    if handle is predNode:
+                        handles.insert(n + 1, node)
+                        return
+            predNode = predNode.prev
+
+        handles.insert(0, node)
+
+    def _indexDiscard(self, node):
+        """
+        Drop a node from the hash index, remove the value when no node holds it anymore.
+
+        Args:
+            node ([_LinkedNode]): Node which should be dropped.
+        """
+        handles = self._index[node.data]
+        for n, handle in enumerate(handles):
+            if handle is node:
+                del handles[n]
+                break
+
+        if not handles:
+            del self._index[node.data]
+
+    def _nodeAt(self, index):
+        """
+        Walk the chain up to the node at the given positive index.
+
+        Args:
+            index ([int]): Positive index.
+
+        Returns:
+            [_LinkedNode]: Node at the index.
+        """
+        curNode = self._head
+        for _ in range(index):
+            curNode = curNode.next
+        return curNode
+
+    def _sliceNodes(self, indices):
+        """
+        Collect the nodes of a resolved slice.
+        The chain is walked once up to the first node of the slice and then only
+        through the sliced span, it's never traversed past the last sliced node.
+        Negative steps collect the span forwards and reverse it.
+
+        Args:
+            indices ([slice]): Resolved slice, as given by _negativeIndices.
+
+        Returns:
+            [list]: Nodes in slice order.
+        """
+        length = self._sliceLength(indices)
+        if not length:
+            return []
+
+        step = abs(indices.step)
+        first = indices.start if indices.step > 0 else indices.start - (length - 1) * step
+
+        nodes = [None] * length
+        curNode = self._nodeAt(first)
+        for n in range(length):
+            nodes[n] = curNode
+            if n == length - 1:
+                break
+            for _ in range(step):
+                curNode = curNode.next
+
+        if indices.step < 0:
+            nodes.reverse()
+        return nodes
+
     def _fromIter(self, iterable):
         """
         Initialize the linked list with elements from a given iterable.
@@ -571,9 +791,10 @@ class LinkedList(_BaseSequence):
 
 
 class _LinkedNode(object):
-    def __init__(self, data, nextItem=None):
+    def __init__(self, data, nextItem=None, prevItem=None):
         self.data = data
         self.next = nextItem
+        self.prev = prevItem
 
     def __str__(self):
         return str(self.data)
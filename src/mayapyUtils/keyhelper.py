@@ -0,0 +1,219 @@
+import numpy as np
+
+
+# Pure NumPy key analysis, works on the arrays given by curvehelper.
+# Doesn't import maya so it can be used and benchmarked outside of it.
+
+
+# ------------------------- Static Key Ranges ------------------------- #
+# --------------------------------------------------------------------- #
+
+
+def static_runs(values, tolerance=0.0, min_length=3):
+    """
+    Run-length encode the static stretches of a key value array in a single pass.
+    A run keeps going while all of it's values stay within the tolerance of each other
+    (max - min <= tolerance), so slow drifts don't get merged into one run.
+
+    Args:
+        values ([np.ndarray, List]): Key values of a single curve.
+        tolerance (Float, optional): Allowed value deviation inside a run. Defaults to 0.0.
+        min_length (Int, optional): Minimal number of keys of a reported run. Defaults to 3.
+
+    Returns:
+        [List]: Pairs of (first index, last index) of every run, both inclusive.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    num = len(values)
+    if not num:
+        return []
+
+    if tolerance <= 0:
+        # -exact equality, the run borders are simply where the values change
+        bounds = np.flatnonzero(values[1:] != values[:-1]) + 1
+        starts = np.concatenate(([0], bounds))
+        ends = np.concatenate((bounds - 1, [num - 1]))
+    else:
+        starts, ends = _tolerance_runs(values.tolist(), tolerance)
+        starts = np.asarray(starts)
+        ends = np.asarray(ends)
+
+    keep = (ends - starts + 1) >= min_length
+    return list(zip(starts[keep].tolist(), ends[keep].tolist()))
+
+
+def _tolerance_runs(values, tolerance):
+    """
+    Greedy single pass over the values, tracking the band of the current run.
+
+    Args:
+        values ([List]): Key values of a single curve.
+        tolerance ([Float]): Allowed value deviation inside a run.
+
+    Returns:
+        [Tuple]: List of start indices and list of end indices.
+    """
+    starts = [0]
+    ends = []
+    low = high = values[0]
+
+    for n, val in enumerate(values):
+        if val < low:
+            low = val
+        elif val > high:
+            high = val
+
+        if high - low > tolerance:
+            ends.append(n - 1)
+            starts.append(n)
+            low = high = val
+
+    ends.append(len(values) - 1)
+    return starts, ends
+
+
+def static_ranges(times, values, tolerance=0.0, min_length=3):
+    """
+    Get the interior time ranges of static stretches, the keys which could be removed
+    without changing the curve. The first and last key of every run are kept.
+
+    Args:
+        times ([np.ndarray, List]): Key times of a single curve.
+        values ([np.ndarray, List]): Key values of a single curve.
+        tolerance (Float, optional): Allowed value deviation inside a run. Defaults to 0.0.
+        min_length (Int, optional): Minimal number of keys of a reported run,
+                                    at least 3 so there is an interior key. Defaults to 3.
+
+    Returns:
+        [List]: Pairs of (start time, end time) of the interior keys, both inclusive.
+    """
+    times = np.asarray(times, dtype=np.float64)
+    runs = static_runs(values, tolerance, max(min_length, 3))
+
+    return [(times[start + 1].item(), times[end - 1].item()) for start, end in runs]
+
+
+def interior_indices(runs):
+    """
+    Key indices lying inside the given runs, without the first and last key of each run.
+
+    Args:
+        runs ([List]): Pairs of (first index, last index) as given by static_runs.
+
+    Returns:
+        [np.ndarray]: Sorted int array of indices.
+    """
+    if not runs:
+        return np.empty(0, dtype=np.int64)
+
+    return np.concatenate([np.arange(start + 1, end, dtype=np.int64)
+                           for start, end in runs])
+
+
+# --------------------------- Key Reduction --------------------------- #
+# --------------------------------------------------------------------- #
+
+
+def reduce_indices(times, values, tolerance):
+    """
+    Ramer-Douglas-Peucker reduction of a curve.
+    Keeps the first and last key and repeatedly the key with the biggest deviation
+    from the line between the kept neighbours, till every dropped key lies within the
+    tolerance of that line. The deviation is measured in value units at the key time,
+    time and value units don't mix so there is no perpendicular distance.
+    With linear tangents the reduced curve stays within the tolerance of every old key.
+
+    Args:
+        times ([np.ndarray, List]): Key times of a single curve.
+        values ([np.ndarray, List]): Key values of a single curve.
+        tolerance ([Float]): Allowed value deviation of a dropped key.
+
+    Returns:
+        [np.ndarray]: Sorted int array of the indices to keep.
+    """
+    times = np.asarray(times, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    num = len(values)
+    if num < 3:
+        return np.arange(num, dtype=np.int64)
+
+    keep = np.zeros(num, dtype=bool)
+    keep[0] = keep[-1] = True
+
+    # -all open segments are split at once, one vectorized pass per level
+    #   instead of one NumPy call per segment
+    firsts = np.array([0], dtype=np.int64)
+    lasts = np.array([num - 1], dtype=np.int64)
+    while len(firsts):
+        counts = lasts - firsts - 1
+        open_segs = counts > 0
+        firsts, lasts, counts = firsts[open_segs], lasts[open_segs], counts[open_segs]
+        if not len(firsts):
+            break
+
+        # -flat arrays of every inner key with the borders of it's segment
+        offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        seg = np.repeat(np.arange(len(firsts)), counts)
+        first = firsts[seg]
+        last = lasts[seg]
+        inner = np.arange(counts.sum()) - offsets[seg] + first + 1
+
+        t0, t1 = times[first], times[last]
+        v0, v1 = values[first], values[last]
+        line = v0 + (v1 - v0) * (times[inner] - t0) / (t1 - t0)
+        error = np.abs(values[inner] - line)
+
+        # -first key with the biggest error per segment, like argmax
+        worst = np.maximum.reduceat(error, offsets)
+        cand = np.flatnonzero(error == worst[seg])
+        _, pick = np.unique(seg[cand], return_index=True)
+        split = inner[cand[pick]]
+
+        over = worst > tolerance
+        split = split[over]
+        keep[split] = True
+
+        firsts, lasts = (np.concatenate((firsts[over], split)),
+                         np.concatenate((split, lasts[over])))
+
+    return np.flatnonzero(keep)
+
+
+def reduce_curve(times, values, tolerance):
+    """
+    Convenient wrapper for reduce_indices, gives the reduced keys.
+
+    Args:
+        times ([np.ndarray, List]): Key times of a single curve.
+        values ([np.ndarray, List]): Key values of a single curve.
+        tolerance ([Float]): Allowed value deviation of a dropped key.
+
+    Returns:
+        [Tuple]: Reduced times and values as float64 arrays.
+    """
+    times = np.asarray(times, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    idx = reduce_indices(times, values, tolerance)
+
+    return times[idx], values[idx]
+
+
+# ---------------------------- Statistics ----------------------------- #
+# --------------------------------------------------------------------- #
+
+
+def ma_key_bytes(times, values):
+    """
+    Estimate how many bytes the given keys take in a .ma file.
+    Keys are written as 'time value' pairs in the '.ktv' setAttr of their curve,
+    tangent and weight attributes come on top, so this is a lower bound.
+
+    Args:
+        times ([np.ndarray, List]): Key times.
+        values ([np.ndarray, List]): Key values.
+
+    Returns:
+        [Int]: Estimated number of bytes.
+    """
+    return sum(len(" {0:.10g} {1:.10g}".format(t, v))
+               for t, v in zip(np.asarray(times).tolist(), np.asarray(values).tolist()))
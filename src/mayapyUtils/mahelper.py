@@ -250,6 +250,11 @@ class ServerBase(QtCore.QObject):
 
     def establish_connection(self):
         self.socket = self.server.nextPendingConnection()
+        # -messages can arrive over many readyRead signals, keep the partial ones
+        self._buffer = bytearray()
+        self._offset = 0
+        self._remaining = -1
+
         if self.socket.state() == QtNetwork.QTcpSocket.ConnectedState:
             self.socket.disconnected.connect(self.on_disconnect)
             self.socket.readyRead.connect(self.read)
@@ -265,36 +270,43 @@ class ServerBase(QtCore.QObject):
         print("[LOG] Connection Disconnected.")
 
     def read(self):
-        bytes_remaining = -1
-        json_data = ""
+        # -append in place and keep a read offset, messages arrive in many small parts
+        #   and rebuilding the buffer on every readyRead would be quadratic
+        self._buffer.extend(self.socket.readAll().data())
 
-        while self.socket.bytesAvailable():
-            # -Header
-            if bytes_remaining <= 0:
-                byte_array = self.socket.read(ServerBase.HEADER_SIZE)
-                bytes_remaining, valid = byte_array.toInt()
+        while True:
+            available = len(self._buffer) - self._offset
 
-                if not valid:
-                    bytes_remaining = -1
+            # -Header
+            if self._remaining < 0:
+                if available < ServerBase.HEADER_SIZE:
+                    break
+
+                header = bytes(self._buffer[self._offset:self._offset + ServerBase.HEADER_SIZE])
+                self._offset += ServerBase.HEADER_SIZE
+                try:
+                    self._remaining = int(header)
+                except ValueError:
+                    self._buffer = bytearray()
+                    self._offset = 0
                     self.write_error("Invalid Header")
-
-                    self.socket.readAll()
                     return
+                continue
 
-            # -Body
-            if bytes_remaining > 0:
-                byte_array = self.socket.read(bytes_remaining)
-                bytes_remaining -= len(byte_array)
-                json_data += byte_array.data().decode()
-
-                if bytes_remaining == 0:
-                    bytes_remaining = -1
+            # -Body, wait for the rest of it
+            if available < self._remaining:
+                break
 
-                    data = json.loads(json_data)
+            body = bytes(self._buffer[self._offset:self._offset + self._remaining])
+            self._offset += self._remaining
+            self._remaining = -1
 
-                    self.process_data(data)
+            self.process_data(json.loads(body.decode()))
 
-                    json_data = ""
+        # -drop what has been consumed once, not per message
+        if self._offset:
+            del self._buffer[:self._offset]
+            self._offset = 0
 
     def write(self, data):
         json_reply = json.dumps(data)
@@ -1,7 +1,11 @@
 import math
 import static
+import posehelper
+import numpy as np
 import maya.cmds as cmds
 import maya.OpenMaya as api
+import maya.api.OpenMaya as api2
+import maya.api.OpenMayaAnim as api2a
 
 from mahelper import ServerBase, set_attribute_keyframes, getMayaWin
 
@@ -157,11 +161,47 @@ class PoseMayaServer(ServerBase):
         self.default_obj = default_obj
 
     def process_data(self, data):
+        # -chunked transfers, see aimocap.send_to_maya_chunked
+        if isinstance(data, dict) and "type" in data:
+            self._process_chunk(data)
+            return
+
         importer = self.importer(mult=self.mult, default_obj=self.default_obj)
         importer.create_skeleton(data)
 
         self.success()
 
+    def _process_chunk(self, data):
+        """
+        Append mode, every chunk gets keyed right away while the next ones are still in flight.
+        Messages are {'type': 'begin', 'frames': N}, {'type': 'chunk', 'start': frame, 'frames': [...]}
+        and {'type': 'end'}, in this order.
+        """
+        kind = data["type"]
+
+        if kind == "begin":
+            self._stream = self.importer(mult=self.mult, default_obj=self.default_obj)
+            self._stream.begin(data.get("frames"))
+            return
+
+        stream = getattr(self, "_stream", None)
+        if stream is None:
+            self.write_error("Chunk without begin")
+            return
+
+        if kind == "chunk":
+            if data["start"] != stream.frame:
+                self._stream = None
+                self.write_error("Missing frames, expected {0} got {1}".format(
+                    stream.frame, data["start"]))
+                return
+            stream.add_frames(data["frames"])
+
+        elif kind == "end":
+            stream.finish()
+            self._stream = None
+            self.success()
+
     def success(self):
         self.write({"success": True})
         print("[LOG] Successfully finished processing.")
@@ -183,68 +223,174 @@ class VideoPose3D_Importer:
         self.objs = []
 
     def create_skeleton(self, data):
+        # -data can be a list or any iterable of frames, like posehelper.iter_json_frames
+        self.begin(len(data) if hasattr(data, "__len__") else None)
+        self.add_frames(data)
+        self.finish()
+
+    def begin(self, frame_length=None):
+        """
+        Start an import which gets it's frames piece by piece through add_frames.
+
+        Args:
+            frame_length ([Int], optional): Number of frames, only for the log. Defaults to None.
+        """
         self.objs = [self._get_obj(i) for i in xrange(17)]
         self._prep()
-        frame_length = len(data)
-        print("\n[LOG] Animation length: {} frames\n".format(frame_length)),
+        self.frame = 0
+        self._do_print = True
+
+        print("\n[LOG] Animation length: {} frames\n".format(
+            frame_length if frame_length is not None else "unknown")),
         print("[LOG] Start processing (this can take a moment)\n"),
 
-        # pos_keys = []
-        # rot_keys = []
-
-        def make_rad(point):
-            return [math.radians(x) for x in point]
-
-        do_print = True
-        for frame, joints in enumerate(data):
-            # rot_per_frame = list(xrange(17))
-            for n, joint in enumerate(joints):
-                obj = self.objs[n]
-
-                try:
-                    idx = 0 if n != 0 else -1
-                    _, idx2 = [
-                        pair for pair in self.pairs if pair[0] == n][idx]
-                    p1 = joint
-                    p2 = joints[idx2]
-
-                    if do_print:
-                        print("Parent={0}".format(obj))
-                        print("Child={0}".format(self.objs[idx2]))
-                    rot = self._get_rotation(p1, p2)
-
-                    # if not frame == 0:
-                    #     last_rot = rot_keys[frame-1][n]
-
-                    #     rot = [cur + (last-math.radians(cur)) for last,
-                    #            cur in zip(last_rot, rot)]
-                    # rot_per_frame[n] = make_rad(rot)
-                    cmds.xform(obj, ro=rot, ws=True)
-                    # cmds.setKeyframe(obj, t=frame, v=rot[0], at='rotateX')
-                    # cmds.setKeyframe(obj, t=frame, v=rot[1], at='rotateY')
-                    # cmds.setKeyframe(obj, t=frame, v=rot[2], at='rotateZ')
-                    cmds.setKeyframe(obj, at="rotate", t=frame+1)
-                except IndexError:
-                    pass
-                    # rot_per_frame[n] = []
-
-                if frame == 0:
-                    mult_data = [i*self.mult for i in joint]
-                    cmds.xform(obj, t=mult_data, ws=True)
-                    # pos_keys.append(mult_data)
-            # rot_keys.append(rot_per_frame)
-            do_print = False
-
-            if frame == 0 and self.default_obj == "joint":
-                self._parenting()
-            self._keying(frame)
-            cmds.currentTime(cmds.currentTime(q=True)+1)
-
-            # if frame > 100:
-            #     print("Frame done: {0}/{1}\n".format(frame, frame_length)),
-
-        # self.set_rotations(rot_keys) #TODO
-        # self.set_positions(pos_keys)
+    def add_frames(self, frames):
+        """
+        Key the next frames, continues where the last call stopped.
+
+        Args:
+            frames ([List]): Iterable of frames, 17 joint positions each.
+        """
+        for joints in frames:
+            self._add_frame(self.frame, joints)
+            self.frame += 1
+
+    def finish(self):
+        """
+        Group and rename the skeleton after the last frame.
+        """
+        self._grouping()
+        self._renaming()
+
+        print("[LOG] Successfully imported skeleton.")
+
+    def _add_frame(self, frame, joints):
+        do_print = self._do_print
+
+        # rot_per_frame = list(xrange(17))
+        for n, joint in enumerate(joints):
+            obj = self.objs[n]
+
+            try:
+                idx = 0 if n != 0 else -1
+                _, idx2 = [
+                    pair for pair in self.pairs if pair[0] == n][idx]
+                p1 = joint
+                p2 = joints[idx2]
+
+                if do_print:
+                    print("Parent={0}".format(obj))
+                    print("Child={0}".format(self.objs[idx2]))
+                rot = self._get_rotation(p1, p2)
+
+                # if not frame == 0:
+                #     last_rot = rot_keys[frame-1][n]
+
+                #     rot = [cur + (last-math.radians(cur)) for last,
+                #            cur in zip(last_rot, rot)]
+                # rot_per_frame[n] = make_rad(rot)
+                cmds.xform(obj, ro=rot, ws=True)
+                # cmds.setKeyframe(obj, t=frame, v=rot[0], at='rotateX')
+                # cmds.setKeyframe(obj, t=frame, v=rot[1], at='rotateY')
+                # cmds.setKeyframe(obj, t=frame, v=rot[2], at='rotateZ')
+                cmds.setKeyframe(obj, at="rotate", t=frame+1)
+            except IndexError:
+                pass
+                # rot_per_frame[n] = []
+
+            if frame == 0:
+                mult_data = [i*self.mult for i in joint]
+                cmds.xform(obj, t=mult_data, ws=True)
+        self._do_print = False
+
+        if frame == 0 and self.default_obj == "joint":
+            self._parenting()
+        self._keying(frame)
+        cmds.currentTime(cmds.currentTime(q=True)+1)
+
+    def create_skeleton_from_bundle(self, bundle):
+        """
+        Build and key the skeleton from a bundle made by posehelper.preprocess,
+        the rotations are already parent relative so nothing gets computed here.
+        The joints are parented while they are unrotated at the origin, this keeps
+        the joint orients zero which the bundle rotations rely on.
+
+        Args:
+            bundle ([Dict]): Bundle as given by posehelper.preprocess or posehelper.load_bundle.
+        """
+        if self.default_obj != "joint":
+            raise ValueError("Pose bundles hold parent relative rotations, they need joints.")
+
+        self.objs = [self._get_obj(i) for i in xrange(len(bundle["parents"]))]
+        self._prep()
+        frame_length = len(bundle["rotations"])
+        print("\n[LOG] Animation length: {} frames\n".format(frame_length)),
+
+        self._parenting()
+        for obj, pos in zip(self.objs, (bundle["rest"] * self.mult).tolist()):
+            cmds.setAttr("{0}.translate".format(obj), *pos)
+        self._keying(0)
+
+        rotations = bundle["rotations"]
+        for jnt in bundle["joints"].tolist():
+            set_attribute_keyframes(
+                rotations[:, jnt].T.tolist(), frame_length, self.objs[jnt], animtype=0)
+
+        self._grouping()
+        self._renaming()
+
+        print("[LOG] Successfully imported skeleton.")
+
+    def create_skeleton_windowed(self, frames, window=1000):
+        """
+        Build and key the skeleton from joint positions, one window of frames at a time.
+        Works on memory mapped pose files (see posehelper.read_pose), only the current window
+        gets loaded and it's keys are written before the next one is touched, so memory
+        stays bound by the window size and not the capture length.
+
+        Args:
+            frames ([np.ndarray]): Joint positions, shape (frames, 17, 3), can be a np.memmap.
+            window (Int, optional): Frames per window. Defaults to 1000.
+        """
+        if self.default_obj != "joint":
+            raise ValueError("Windowed import keys parent relative rotations, it needs joints.")
+
+        num = frames.shape[1]
+        self.objs = [self._get_obj(i) for i in xrange(num)]
+        self._prep()
+        frame_length = len(frames)
+        print("\n[LOG] Animation length: {} frames\n".format(frame_length)),
+
+        aims = posehelper.aim_pairs()
+        parents = posehelper.parent_indices(num)
+
+        self._parenting()
+        rest = posehelper.rest_offsets(frames[0], aims, parents) * self.mult
+        for obj, pos in zip(self.objs, rest.tolist()):
+            cmds.setAttr("{0}.translate".format(obj), *pos)
+        self._keying(0)
+
+        # -one curve per rotate channel, every window appends it's keys
+        curves = {}
+        for jnt, _ in aims:
+            for c, axis in enumerate("XYZ"):
+                plug = api2.MSelectionList().add(
+                    "{0}.rotate{1}".format(self.objs[jnt], axis)).getPlug(0)
+                animfn = api2a.MFnAnimCurve()
+                animfn.create(plug, api2a.MFnAnimCurve.kAnimCurveTA)
+                curves[jnt, c] = animfn
+
+        unit = api2.MTime.uiUnit()
+        for start in xrange(0, frame_length, window):
+            chunk = np.asarray(frames[start:start + window], dtype=np.float64)
+            rotations = posehelper.local_rotations(chunk, aims, parents)
+
+            times = api2.MTimeArray([api2.MTime(t + 1, unit)
+                                     for t in xrange(start, start + len(chunk))])
+            for (jnt, c), animfn in curves.items():
+                animfn.addKeys(times, api2.MDoubleArray(rotations[:, jnt, c].tolist()))
+
+            print("[LOG] Keyed frames: {0}/{1}".format(start + len(chunk), frame_length))
 
         self._grouping()
         self._renaming()
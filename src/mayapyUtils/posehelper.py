@@ -0,0 +1,539 @@
+import multiprocessing
+import struct
+import array
+import numpy as np
+import static
+import json
+import sys
+import re
+
+
+# Pure NumPy pose preprocessing and pose files, turns VideoPose3D predictions into keyable data.
+# Doesn't import maya so it can run offline, next to the inference.
+
+
+BUNDLE_VERSION = 1
+POSE_VERSION = 1
+POSE_MAGIC = b"VP3D"
+
+# -magic, version, header size
+_poseStruct = struct.Struct("<4sHI")
+
+
+# ---------------------------- Topology ------------------------------- #
+# --------------------------------------------------------------------- #
+
+
+def aim_pairs(chains=static.VideoPoseChains, skips=static.Skips, pairs=static.VideoPosePairs):
+    """
+    Get the joint every joint aims at, walking the chains.
+    Chain tops listed in skips take their aim from the pair table instead,
+    the hip aims at the spine like the importer does. Chain ends have no aim.
+
+    Args:
+        chains ([List], optional): Joint chains. Defaults to static.VideoPoseChains.
+        skips ([List], optional): Chain tops. Defaults to static.Skips.
+        pairs ([List], optional): Parent child pairs. Defaults to static.VideoPosePairs.
+
+    Returns:
+        [List]: Sorted pairs of (joint, aim joint).
+    """
+    aims = {}
+    for chain in chains:
+        for jnt, child in zip(chain[:-1], chain[1:]):
+            if jnt not in skips:
+                aims.setdefault(jnt, child)
+
+    for top in skips:
+        children = [c for p, c in pairs if p == top]
+        if children:
+            aims[top] = children[-1 if top == 0 else 0]
+
+    return sorted(aims.items())
+
+
+def parent_indices(num=17, pairs=static.VideoPosePairs):
+    """
+    Get the parent of every joint, as the importer parents them.
+
+    Args:
+        num (Int, optional): Number of joints. Defaults to 17.
+        pairs ([List], optional): Parent child pairs. Defaults to static.VideoPosePairs.
+
+    Returns:
+        [np.ndarray]: Int array with the parent index per joint, -1 for the root.
+    """
+    parents = np.full(num, -1, dtype=np.int64)
+    for parent, child in pairs:
+        parents[child] = parent
+    return parents
+
+
+# ----------------------------- Rotations ----------------------------- #
+# --------------------------------------------------------------------- #
+
+
+def aim_matrices(positions, aims):
+    """
+    World rotation matrices which turn the Y axis onto the direction from the aim joint
+    to the joint, the shortest arc like MQuaternion(MVector(0, 1, 0), direction).
+
+    Args:
+        positions ([np.ndarray]): Joint positions, shape (frames, joints, 3).
+        aims ([List]): Pairs of (joint, aim joint) as given by aim_pairs.
+
+    Returns:
+        [np.ndarray]: Column vector rotation matrices, shape (frames, joints, 3, 3),
+                      identity for joints without aim.
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    frames, num = positions.shape[:2]
+
+    mats = np.zeros((frames, num, 3, 3))
+    mats[:, :, [0, 1, 2], [0, 1, 2]] = 1.0
+    if not aims:
+        return mats
+
+    jnts, targets = np.asarray(aims, dtype=np.int64).T
+    direction = positions[:, jnts] - positions[:, targets]
+    length = np.sqrt((direction * direction).sum(axis=-1, keepdims=True))
+    u = direction / np.where(length > 0, length, 1.0)
+
+    # -half way quaternion, (Y x u, 1 + Y.u), 180 degrees around X when u points down
+    x, y, z = u[..., 2], np.zeros_like(u[..., 0]), -u[..., 0]
+    w = 1.0 + u[..., 1]
+    flip = w < 1e-9
+    x = np.where(flip, 1.0, x)
+    w = np.where(flip, 0.0, w)
+
+    norm = np.sqrt(x * x + y * y + z * z + w * w)
+    x, y, z, w = x / norm, y / norm, z / norm, w / norm
+
+    rot = np.empty(x.shape + (3, 3))
+    rot[..., 0, 0] = 1 - 2 * (y * y + z * z)
+    rot[..., 0, 1] = 2 * (x * y - z * w)
+    rot[..., 0, 2] = 2 * (x * z + y * w)
+    rot[..., 1, 0] = 2 * (x * y + z * w)
+    rot[..., 1, 1] = 1 - 2 * (x * x + z * z)
+    rot[..., 1, 2] = 2 * (y * z - x * w)
+    rot[..., 2, 0] = 2 * (x * z - y * w)
+    rot[..., 2, 1] = 2 * (y * z + x * w)
+    rot[..., 2, 2] = 1 - 2 * (x * x + y * y)
+
+    mats[:, jnts] = rot
+    return mats
+
+
+def euler_xyz(mats):
+    """
+    Euler angles of rotation matrices in maya's XYZ rotate order.
+
+    Args:
+        mats ([np.ndarray]): Column vector rotation matrices, shape (..., 3, 3).
+
+    Returns:
+        [np.ndarray]: Angles in radians, shape (..., 3).
+    """
+    sy = -np.clip(mats[..., 2, 0], -1.0, 1.0)
+    cy = np.sqrt(mats[..., 0, 0] ** 2 + mats[..., 1, 0] ** 2)
+    gimbal = cy < 1e-9
+
+    res = np.empty(mats.shape[:-2] + (3,))
+    res[..., 0] = np.where(gimbal, 0.0, np.arctan2(mats[..., 2, 1], mats[..., 2, 2]))
+    res[..., 1] = np.arctan2(sy, cy)
+    res[..., 2] = np.where(gimbal, np.arctan2(-mats[..., 0, 1], mats[..., 1, 1]),
+                           np.arctan2(mats[..., 1, 0], mats[..., 0, 0]))
+    return res
+
+
+def local_rotations(positions, aims, parents):
+    """
+    Parent relative euler rotations of every joint, the values to key on a
+    joint hierarchy without joint orients.
+
+    Args:
+        positions ([np.ndarray]): Joint positions, shape (frames, joints, 3).
+        aims ([List]): Pairs of (joint, aim joint) as given by aim_pairs.
+        parents ([np.ndarray]): Parent per joint as given by parent_indices.
+
+    Returns:
+        [np.ndarray]: Float32 angles in radians, shape (frames, joints, 3).
+    """
+    world = aim_matrices(positions, aims)
+    parent_world = world[:, np.maximum(parents, 0)]
+    parent_world[:, parents < 0] = np.eye(3)
+
+    local = np.einsum("fjik,fjil->fjkl", parent_world, world)
+    return euler_xyz(local).astype(np.float32)
+
+
+def rest_offsets(first, aims, parents):
+    """
+    Offsets of every joint to it's parent in parent space, on the first frame.
+    The importer only places the joints once, the rotations move them afterwards.
+
+    Args:
+        first ([np.ndarray]): Joint positions of the first frame, shape (joints, 3).
+        aims ([List]): Pairs of (joint, aim joint) as given by aim_pairs.
+        parents ([np.ndarray]): Parent per joint as given by parent_indices.
+
+    Returns:
+        [np.ndarray]: Float32 offsets, the root in world space, shape (joints, 3).
+    """
+    first = np.asarray(first, dtype=np.float64)
+    world = aim_matrices(first[None], aims)[0]
+
+    rest = first.copy()
+    for jnt, parent in enumerate(parents.tolist()):
+        if parent >= 0:
+            rest[jnt] = world[parent].T.dot(first[jnt] - first[parent])
+
+    return rest.astype(np.float32)
+
+
+def _chunk_rotations(args):
+    # -module level so the process pool can pickle it
+    return local_rotations(*args)
+
+
+# ------------------------------ Pipeline ----------------------------- #
+# --------------------------------------------------------------------- #
+
+
+def preprocess(prediction, chunk_size=4096, processes=None):
+    """
+    Turn a VideoPose3D prediction into everything the importer keys, long clips
+    are split into chunks of frames and processed by a pool of processes.
+
+    Args:
+        prediction ([np.ndarray]): World positions, shape (frames, 17, 3).
+        chunk_size (Int, optional): Frames per chunk. Defaults to 4096.
+        processes ([Int], optional): Pool size, 1 keeps everything in this process.
+                                     Defaults to None, the number of cpus.
+
+    Returns:
+        [Dict]: The bundle, see save_bundle.
+    """
+    prediction = np.asarray(prediction, dtype=np.float64)
+    frames, num = prediction.shape[:2]
+
+    aims = aim_pairs()
+    parents = parent_indices(num)
+
+    starts = range(0, frames, chunk_size)
+    if len(starts) > 1 and processes != 1:
+        jobs = [(prediction[s:s + chunk_size], aims, parents) for s in starts]
+        pool = multiprocessing.Pool(processes)
+        try:
+            rotations = np.concatenate(pool.map(_chunk_rotations, jobs))
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        rotations = local_rotations(prediction, aims, parents)
+
+    return {
+        "version": np.int64(BUNDLE_VERSION),
+        "positions": prediction.astype(np.float32),
+        "rotations": rotations,
+        "rest": rest_offsets(prediction[0], aims, parents),
+        "parents": parents,
+        "joints": np.asarray([a[0] for a in aims], dtype=np.int64),
+    }
+
+
+def save_bundle(path, bundle):
+    """
+    Write a preprocessed bundle as an uncompressed .npz.
+
+    Keys:
+        version: Bundle version.
+        positions: Float32 world positions, (frames, joints, 3).
+        rotations: Float32 parent relative XYZ eulers in radians, (frames, joints, 3).
+        rest: Float32 first frame offsets in parent space, the root in world space, (joints, 3).
+        parents: Parent per joint, -1 for the root.
+        joints: Joints which carry a rotation.
+
+    Args:
+        path ([Str]): Output path.
+        bundle ([Dict]): Bundle as given by preprocess.
+    """
+    with open(str(path), "wb") as f:
+        np.savez(f, **bundle)
+
+
+def load_bundle(path):
+    """
+    Read a bundle written by save_bundle.
+
+    Args:
+        path ([Str]): Path to the .npz file.
+
+    Returns:
+        [Dict]: The bundle.
+    """
+    with np.load(str(path)) as data:
+        bundle = dict((k, data[k]) for k in data.files)
+
+    if int(bundle["version"]) != BUNDLE_VERSION:
+        raise ValueError("Unsupported pose bundle version: {0}".format(int(bundle["version"])))
+
+    return bundle
+
+
+# ----------------------------- Pose Files ---------------------------- #
+# --------------------------------------------------------------------- #
+
+
+def _pose_header(frames, joints, fps, units, pairs, names, reserve=0):
+    # -encoded JSON header, padded so the float block starts aligned
+    #   reserve keeps room to rewrite it later with a bigger frame count
+    header = json.dumps({
+        "frames": frames,
+        "joints": joints,
+        "fps": fps,
+        "units": units,
+        "dtype": "<f4",
+        "pairs": [list(p) for p in pairs],
+        "names": dict((str(k), v) for k, v in names.items()),
+    }).encode("utf-8")
+
+    size = _poseStruct.size + len(header) + reserve
+    return header + b" " * (reserve + (-size % 16))
+
+
+def write_pose(path, positions, fps=None, units="m", pairs=static.VideoPosePairs,
+               names=static.VideoPoseNames):
+    """
+    Write joint positions into a binary pose file.
+    Layout: 4 byte magic 'VP3D', uint16 version, uint32 header size, a JSON header
+    padded to 16 bytes and the little endian float32 block of shape (frames, joints, 3).
+
+    Args:
+        path ([Str]): Output path, .pose by convention.
+        positions ([np.ndarray, List]): Joint positions, shape (frames, joints, 3).
+        fps ([Float], optional): Frame rate of the capture. Defaults to None, unknown.
+        units (Str, optional): Distance unit of the positions. Defaults to "m".
+        pairs ([List], optional): Parent child pairs. Defaults to static.VideoPosePairs.
+        names ([Dict], optional): Joint names by index. Defaults to static.VideoPoseNames.
+    """
+    positions = np.ascontiguousarray(positions, dtype="<f4")
+    if positions.ndim != 3 or positions.shape[2] != 3:
+        raise ValueError("Expected positions of shape (frames, joints, 3), got {0}".format(
+            positions.shape))
+
+    header = _pose_header(positions.shape[0], positions.shape[1], fps, units, pairs, names)
+
+    with open(str(path), "wb") as f:
+        f.write(_poseStruct.pack(POSE_MAGIC, POSE_VERSION, len(header)))
+        f.write(header)
+        f.write(positions.tobytes())
+
+
+def write_pose_stream(path, frames, fps=None, units="m", pairs=static.VideoPosePairs,
+                      names=static.VideoPoseNames, chunk_size=1024):
+    """
+    Write frames from any iterable into a pose file, chunk by chunk.
+    The frame count isn't known up front, the header is written with room to spare
+    and rewritten with the real count at the end. The header is longer than the one
+    of write_pose, the files differ in bytes but read_pose gives the same header values and frames.
+
+    Args:
+        path ([Str]): Output path, .pose by convention.
+        frames ([Iterable]): Joint positions per frame, each of shape (joints, 3).
+        fps ([Float], optional): Frame rate of the capture. Defaults to None, unknown.
+        units (Str, optional): Distance unit of the positions. Defaults to "m".
+        pairs ([List], optional): Parent child pairs. Defaults to static.VideoPosePairs.
+        names ([Dict], optional): Joint names by index. Defaults to static.VideoPoseNames.
+        chunk_size (Int, optional): Frames converted and written at once. Defaults to 1024.
+
+    Returns:
+        [Int]: Number of written frames.
+    """
+    frames = iter(frames)
+    first = next(frames, None)
+    joints = 0 if first is None else len(first)
+
+    # -room for 20 digits, more frames than any file could hold
+    header = _pose_header(0, joints, fps, units, pairs, names, reserve=20)
+    count = 0
+
+    with open(str(path), "wb") as f:
+        f.write(_poseStruct.pack(POSE_MAGIC, POSE_VERSION, len(header)))
+        f.write(header)
+
+        chunk = [] if first is None else [first]
+        for frame in frames:
+            chunk.append(frame)
+            if len(chunk) == chunk_size:
+                count += _write_chunk(f, chunk, joints)
+                chunk = []
+        count += _write_chunk(f, chunk, joints)
+
+        final = _pose_header(count, joints, fps, units, pairs, names)
+        f.seek(_poseStruct.size)
+        f.write(final + b" " * (len(header) - len(final)))
+
+    return count
+
+
+def _write_chunk(f, chunk, joints):
+    if not chunk:
+        return 0
+
+    positions = np.asarray(chunk, dtype="<f4").reshape(len(chunk), joints, 3)
+    f.write(positions.tobytes())
+    return len(chunk)
+
+
+def read_pose_header(path):
+    """
+    Read the header of a pose file.
+
+    Args:
+        path ([Str]): Path to the pose file.
+
+    Returns:
+        [Dict]: The header, 'offset' holds the byte position of the float block.
+    """
+    with open(str(path), "rb") as f:
+        magic, version, size = _poseStruct.unpack(f.read(_poseStruct.size))
+        if magic != POSE_MAGIC:
+            raise ValueError("Not a pose file: {0}".format(path))
+        if version != POSE_VERSION:
+            raise ValueError("Unsupported pose file version: {0}".format(version))
+
+        header = json.loads(f.read(size).decode("utf-8"))
+
+    header["version"] = version
+    header["offset"] = _poseStruct.size + size
+    return header
+
+
+def read_pose(path, mmap=True):
+    """
+    Read a pose file, the frames are memory mapped by default so only touched frames get loaded.
+
+    Args:
+        path ([Str]): Path to the pose file.
+        mmap (Bool, optional): If False read everything into memory. Defaults to True.
+
+    Returns:
+        [Tuple]: The header and the float32 frames of shape (frames, joints, 3).
+    """
+    header = read_pose_header(path)
+    shape = (header["frames"], header["joints"], 3)
+
+    if not header["frames"]:
+        return header, np.empty(shape, dtype="<f4")
+
+    if mmap:
+        return header, np.memmap(str(path), dtype="<f4", mode="r",
+                                 offset=header["offset"], shape=shape)
+
+    with open(str(path), "rb") as f:
+        f.seek(header["offset"])
+        frames = np.fromfile(f, dtype="<f4", count=shape[0] * shape[1] * 3)
+    return header, frames.reshape(shape)
+
+
+def read_pose_array(path):
+    """
+    Read the frames of a pose file without NumPy, through array.fromfile.
+
+    Args:
+        path ([Str]): Path to the pose file.
+
+    Returns:
+        [Tuple]: The header and a flat float array, 3 values per joint and frame.
+    """
+    header = read_pose_header(path)
+
+    values = array.array("f")
+    with open(str(path), "rb") as f:
+        f.seek(header["offset"])
+        values.fromfile(f, header["frames"] * header["joints"] * 3)
+
+    if sys.byteorder != "little":
+        values.byteswap()
+    return header, values
+
+
+def iter_json_frames(path, chunk_size=1 << 16):
+    """
+    Yield the frames of a VideoPose3D .json export one by one, without loading the document.
+    The file is read in chunks and scanned for the elements of the top level array,
+    only the text of the current frame gets parsed, memory stays flat for any file size.
+
+    Args:
+        path ([Str]): Path to the .json file.
+        chunk_size (Int, optional): Characters read at once. Defaults to 65536.
+
+    Yields:
+        [List]: Joint positions of a frame, 17 lists of 3 floats.
+    """
+    depth = 0
+    in_string = False
+    skip = -1  # -index of an escaped character, relative to the current chunk
+    frame = []
+
+    with open(str(path), "r") as f:
+        for chunk in iter(lambda: f.read(chunk_size), ""):
+            start = 0 if depth > 1 else None
+
+            # -numbers and whitespace can't change the structure, only jump between the rest
+            for match in _jsonTokens.finditer(chunk):
+                n = match.start()
+                char = chunk[n]
+
+                if n == skip:
+                    continue
+                if in_string:
+                    if char == "\\":
+                        skip = n + 1
+                    elif char == '"':
+                        in_string = False
+                elif char == '"':
+                    in_string = True
+                elif char in "[{":
+                    depth += 1
+                    if depth == 2:
+                        start = n
+                elif char in "]}":
+                    depth -= 1
+                    if depth == 1:
+                        frame.append(chunk[start:n + 1])
+                        yield json.loads("".join(frame))
+                        frame = []
+                        start = None
+                    elif depth < 0:
+                        raise ValueError("Unbalanced brackets in {0}".format(path))
+
+            skip -= len(chunk)
+            # -frame continues in the next chunk
+            if start is not None:
+                frame.append(chunk[start:])
+
+    if depth:
+        raise ValueError("Unexpected end of {0}".format(path))
+
+
+#   Structural JSON characters
+_jsonTokens = re.compile(r'[\[\]{}"\\]')
+
+
+def json_to_pose(json_path, pose_path, fps=None, units="m"):
+    """
+    Convert a VideoPose3D .json export into a pose file.
+    The frames are streamed through iter_json_frames, memory stays flat for any file size.
+
+    Args:
+        json_path ([Str]): Path to the .json file.
+        pose_path ([Str]): Output path.
+        fps ([Float], optional): Frame rate of the capture. Defaults to None, unknown.
+        units (Str, optional): Distance unit of the positions. Defaults to "m".
+
+    Returns:
+        [Int]: Number of converted frames.
+    """
+    return write_pose_stream(pose_path, iter_json_frames(json_path), fps, units)
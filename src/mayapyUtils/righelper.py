@@ -1,8 +1,17 @@
+import maya.api.OpenMayaAnim as api2a
+import maya.api.OpenMaya as api2
 import maya.cmds as cmds
+import numpy as np
 import math
 import json
+import re
 import mahelper
 import pose2maya
+import posehelper
+import curvehelper
+import keyhelper
+import xformhelper
+import static
 from pyUtils import pyhelper
 # TODO change list comprehensions to pass pure lists into commands as they are designed that way :/
 
@@ -11,7 +20,105 @@ from pyUtils import pyhelper
 # --------------------------------------------------------------------- #
 
 
-def joint_search(a_jnts, jnt_ids):
+class JointIndex(object):
+    """
+    Lookup of joints by the numeric id in their short name, every name is parsed once.
+    By default the id is made of all digits in the short name, like 'joint_1_2' -> '12'.
+    With a regex the first group (or the whole match without groups) is the id.
+
+    Args:
+        jnts ([List], optional): Joints to index. Defaults to None.
+        pattern ([Str], optional): Regex used to extract the id. Defaults to None.
+    """
+
+    def __init__(self, jnts=None, pattern=None):
+        self.pattern = re.compile(pattern) if pattern else None
+        self._ids = {}
+        self._names = {}
+
+        for jnt in jnts or []:
+            self.add(jnt)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, jnt):
+        return jnt in self._names
+
+    def parse(self, jnt):
+        """
+        Get the id of a joint name.
+
+        Args:
+            jnt ([Str]): Joint name, short or full path.
+
+        Returns:
+            [Str]: The id, empty if the name has none.
+        """
+        short = str(jnt).rsplit("|", 1)[-1]
+
+        if self.pattern is None:
+            return ''.join(c for c in short if c.isdigit())
+
+        match = self.pattern.search(short)
+        if not match:
+            return ""
+        return match.group(1) if match.groups() else match.group(0)
+
+    def add(self, jnt):
+        """
+        Add a joint, a joint given twice is listed twice.
+
+        Args:
+            jnt ([Str]): Joint name, short or full path.
+        """
+        idx = self.parse(jnt)
+        self._ids.setdefault(idx, []).append(jnt)
+        self._names[jnt] = idx
+
+    def remove(self, jnt):
+        """
+        Remove a joint from the index.
+
+        Args:
+            jnt ([Str]): Joint name as it was added.
+        """
+        idx = self._names.pop(jnt)
+        jnts = self._ids[idx]
+        jnts.remove(jnt)
+        if jnt in jnts:
+            self._names[jnt] = idx
+        if not jnts:
+            del self._ids[idx]
+
+    def rename(self, old, new):
+        """
+        Update the index after a joint got renamed, only this joint is parsed again.
+
+        Args:
+            old ([Str]): Joint name as it was added.
+            new ([Str]): The new name.
+        """
+        self.remove(old)
+        self.add(new)
+
+    def find(self, jnt_ids):
+        """
+        Get all joints of the given ids.
+
+        Args:
+            jnt_ids ([List]): Ids, ints or strings.
+
+        Returns:
+            [List]: Found joints in order of the ids, empty if nothing found.
+        """
+        res = []
+        for idx in jnt_ids:
+            res.extend(self._ids.get(str(idx), ()))
+        return res
+
+
+def joint_search(a_jnts, jnt_ids, index=None):
     """
     Search  a joint based on it's numeric value given by it's name.
     Only works if given joints are numerically named.
@@ -19,55 +126,63 @@ def joint_search(a_jnts, jnt_ids):
     Args:
         a_jnts ([List]): All joints in which to look for.
         jnt_ids ([List]): List containing ints contained by the joints.
+        index ([JointIndex], optional): Prebuilt index to reuse over many searches,
+                                        a_jnts is ignored when given. Defaults to None.
 
     Returns:
         [List]: Found joints, empty if nothing found.
     """
-    res = []
-    for idx in jnt_ids:
-        for n, jnt in enumerate(a_jnts):
-            if "|" in jnt:
-                jnt = jnt.rsplit("|")[-1]
-
-            if str(idx) == ''.join(filter(str.isdigit, str(jnt))):
-                res.append(a_jnts[n])
-    return res
+    if index is None:
+        index = JointIndex(a_jnts)
+    return index.find(jnt_ids)
 
 
 def move_keyframes(top_parent, mv=5):
     """
     Move keyframes for given node and all children by the given amount in frames.
+    All curves of the hierarchy are collected in one query and shifted with a single,
+    undoable keyframe edit.
 
     Args:
         top_parent ([Str]): Name of the top most node.
         mv (Int, optional): The amount by which it should be moved, given in frames. Defaults to 5.
+
+    Returns:
+        [List]: Names of the moved animation curves.
     """
-    all_jnts = cmds.listRelatives(top_parent, ad=True, f=True)
-    all_jnts.append(top_parent)
+    anims = curvehelper.list_hierarchy_curves(top_parent)
 
-    for jnt in all_jnts:
-        anims = cmds.listConnections(jnt, t="animCurve")
+    if anims:
+        cmds.keyframe(anims, edit=True, relative=True, timeChange=mv)
 
-        if anims:
-            for anim in anims:
-                cmds.keyframe(anim, edit=True, relative=True, timeChange=mv)
+    return anims
 
 
-def import_videopose(path):
+def import_videopose(path, window=1000):
     """
-    Import 3d points of a VideoPose3D inference given in .Json.
+    Import 3d points of a VideoPose3D inference given in .Json or binary .pose,
+    or a preprocessed pose bundle given in .npz (see posehelper).
 
     Args:
-        path ([Str]): Path to .Json file.
+        path ([Str]): Path to .Json, .pose or .npz file.
+        window (Int, optional): Frames keyed at once for .pose files, which get memory mapped. Defaults to 1000.
 
     Returns:
         [mahelper.VideoPose_Importer]: Importer class which holds the relevant information.
     """
-    with open(path, "r") as f:
-        data = json.load(f)
-
     pose = pose2maya.VideoPose3D_Importer()
-    pose.create_skeleton(data)
+
+    if str(path).lower().endswith(".npz"):
+        pose.create_skeleton_from_bundle(posehelper.load_bundle(path))
+        return pose
+
+    if str(path).lower().endswith(".pose"):
+        _, frames = posehelper.read_pose(path)
+        pose.create_skeleton_windowed(frames, window)
+        return pose
+
+    # -legacy .json, streamed frame by frame
+    pose.create_skeleton(posehelper.iter_json_frames(path))
     return pose
 
 
@@ -100,10 +215,14 @@ def all_jnts_pose(jnts):
 
     Args:
         jnts ([List]): List containing the str names of the joints.
+
+    Returns:
+        [xformhelper.TransformBatch]: The written batch, call undo() to revert.
     """
-    for jnt in jnts:
-        x, y, z = cmds.xform(jnt, q=True, t=True)
-        cmds.xform(jnt, t=[x, y, 0])
+    batch = xformhelper.TransformBatch(jnts)
+    batch.zero([2])
+    batch.write()
+    return batch
 
 
 # only top leg joints
@@ -114,18 +233,22 @@ def leg_jnts_pose(leg_jnts):
 
     Args:
         leg_jnts ([List]): List containing the str names of the joints.
+
+    Returns:
+        [xformhelper.TransformBatch]: The written batch, call undo() to revert.
     """
+    nodes = []
+    tops = []
     for leg_jnt in leg_jnts:
-        all_jnts = cmds.listRelatives(leg_jnt, ad=True, f=True)
-        all_jnts.append(leg_jnt)
+        tops.append(len(nodes))
+        nodes.append(leg_jnt)
+        nodes.extend(cmds.listRelatives(leg_jnt, ad=True, f=True) or [])
 
-        for jnt in all_jnts:
-            x, y, z = cmds.xform(jnt, q=True, t=True)
-
-            if jnt == leg_jnt:
-                cmds.xform(jnt, t=[x, 0, z])
-            else:
-                cmds.xform(jnt, t=[0, y, z])
+    batch = xformhelper.TransformBatch(nodes)
+    batch.zero([1], tops)
+    batch.zero([0], sorted(set(range(len(nodes))) - set(tops)))
+    batch.write()
+    return batch
 
 
 # only spine joints
@@ -136,62 +259,61 @@ def spine_jnts_pose(spine_jnts):
 
     Args:
         spine_jnts ([List]): List containing the str names of the joints.
+
+    Returns:
+        [xformhelper.TransformBatch]: The written batch, call undo() to revert.
     """
-    for spine in spine_jnts:
-        x, y, z = cmds.xform(spine, q=True, t=True)
-        cmds.xform(spine, t=[0, y, z])
+    batch = xformhelper.TransformBatch(spine_jnts)
+    batch.zero([0])
+    batch.write()
+    return batch
 
 
 # only first 2 top arm joints
 
 def arm_jnts_pose(arm_jnts, clean=True):
     """
-    Try to pose the arm joints by drawing a curve in 45 degree
-    and snaping the arm joints to the nearest position on the curve.
+    Try to pose the arm joints along a line in 45 degree
+    and snaping the arm joints to the nearest position on the line.
+    The line is projected on analytically, no curve or scene nodes get created.
 
     Args:
         arm_jnts ([List]): List containing the top most arm joints.
-        clean (Bool, optional): If True delete the resulting curves. Defaults to True.
+        clean (Bool, optional): Unused, kept for compatibility, nothing has to be cleaned up. Defaults to True.
     """
-    dels = []
-
     for top_jnt in arm_jnts:
 
         jnt_pos = cmds.xform(top_jnt, q=True, t=True, ws=True)
         end_pos = [jnt_pos[0]*4, jnt_pos[1]/4, jnt_pos[2]]
 
-        crv = cmds.curve(p=[end_pos, jnt_pos], d=1)
-        childs = cmds.listRelatives(top_jnt, ad=True, f=True)
-
-        if clean:
-            dels.append(crv)
+        childs = cmds.listRelatives(top_jnt, ad=True, f=True) or []
 
+        # -children follow their snapped parents, query each one after the last move
         for tar_jnt in sorted(childs):
             tar_pnt = cmds.xform(tar_jnt, q=True, t=True, ws=True)
-            near_pos = get_nearestPoint(crv, tar_pnt)
-
-            cmds.xform(tar_jnt, t=near_pos, ws=True)
+            near_pos = xformhelper.nearest_on_segment(end_pos, jnt_pos, tar_pnt)[0]
 
-    if dels:
-        [cmds.delete(d) for d in dels]
+            cmds.xform(tar_jnt, t=near_pos.tolist(), ws=True)
 
 
 def get_nearestPoint(curve, pnt, near_nd=None, clean=True):
     """
-    Create a 'nearestPointOnCurve' node and plug in the given curve and source position.
+    Get the nearest position on a curve from a given source position.
+    Queries the curve through MFnNurbsCurve, when a 'nearestPointOnCurve' node is supplied
+    it gets plugged in with the given curve and source position instead.
 
     Args:
         curve ([Str]): The curve to look for points.
         pnt ([List]): Vector3 List containing the source point from which to look, in WorldSpace.
         near_nd ([Str], optional): Supply when a 'nearestPointOnCurve' node already exists thats should be used. 
         Defaults to None.
-        clean (Bool, optional): If True delete all created nodes. Defaults to True.
+        clean (Bool, optional): If True delete the supplied node. Defaults to True.
 
     Returns:
         [List]: Vector3 List containing the found position.
     """
     if not near_nd:
-        near_nd = cmds.createNode("nearestPointOnCurve")
+        return tuple(xformhelper.nearest_on_curve(curve, [pnt])[0].tolist())
 
     cmds.setAttr("{0}.inPosition".format(near_nd), pnt[0], pnt[1], pnt[2])
     cmds.connectAttr("{0}.worldSpace[0]".format(
@@ -205,6 +327,20 @@ def get_nearestPoint(curve, pnt, near_nd=None, clean=True):
     return ret
 
 
+def get_nearestPoints(curve, pnts):
+    """
+    Get the nearest positions on a curve for many source positions in one batch.
+
+    Args:
+        curve ([Str]): The curve to look for points.
+        pnts ([List]): Vector3 Lists containing the source points, in WorldSpace.
+
+    Returns:
+        [List]: Vector3 Lists containing the found positions.
+    """
+    return xformhelper.nearest_on_curve(curve, pnts).tolist()
+
+
 # only joints with same amount of children
 
 def mirror_jnts(first, second):
@@ -214,16 +350,31 @@ def mirror_jnts(first, second):
     Args:
         first ([Str]): Source joint which should be applied.
         second ([Str]): Target joint which should be mirrored.
+
+    Returns:
+        [xformhelper.TransformBatch]: The written batch of the target chain, call undo() to revert.
     """
-    childs = cmds.listRelatives(first, c=True, f=True)
-    childs_sec = cmds.listRelatives(second, c=True, f=True)
-    if childs:
-        mirror_jnts(childs[0], childs_sec[0] if childs_sec else second)
+    # -walk both chains along the first child, a shorter target chain
+    #   keeps it's last joint, which then takes the top most source left
+    sources = []
+    targets = []
+    while first:
+        if second not in targets:
+            sources.append(first)
+            targets.append(second)
+
+        childs = cmds.listRelatives(first, c=True, f=True)
+        childs_sec = cmds.listRelatives(second, c=True, f=True)
+        first = childs[0] if childs else None
+        second = childs_sec[0] if childs_sec else second
 
-    # base case
-    first_pos = cmds.xform(first, q=True, t=True)
-    first_pos[0] *= -1
-    cmds.xform(second, t=first_pos)
+    source = xformhelper.TransformBatch(sources)
+    batch = xformhelper.TransformBatch(targets)
+
+    batch.local[:] = source.local
+    batch.mirror(0)
+    batch.write()
+    return batch
 
 
 # only joints in pairs, should be parent and child joints
@@ -249,28 +400,47 @@ def get_dist(vec1, vec2):
 def get_max_dist(first, second, t_range):
     """
     Find the longest distance between to objects over time.
+    Both objects are sampled in one pass through xformhelper, the timeline isn't moved.
 
     Args:
         first ([Str]): Start object.
         second ([Str]): End object.
-        t_range ([Int]): The range in which to check the distance.
+        t_range ([Int]): The range in which to check the distance, starting at the current time.
 
     Returns:
         [Float]: Found distance.
     """
-    dists = []
-    t_og = cmds.currentTime(q=True)
-    for _ in range(int(t_range)):
-        vec1 = cmds.xform(first, q=True, t=True, ws=True)
-        vec2 = cmds.xform(second, q=True, t=True, ws=True)
+    positions = xformhelper.sample_range([first, second], t_range)
+
+    return float(xformhelper.pair_distances(positions, [(0, 1)]).max())
+
+
+def get_bone_lengths(pairs, t_range, start=None):
+    """
+    Find the shortest and longest distance of many object pairs over time.
+    All objects are sampled in one shared pass, the distances of every pair
+    come from one vectorized step.
+
+    Args:
+        pairs ([List]): Pairs of (first, second) object names.
+        t_range ([Int]): The range in which to check the distance.
+        start ([Float], optional): First frame. Defaults to None, the current time.
 
-        dist = get_dist(vec1, vec2)
-        dists.append(dist)
-        cmds.currentTime(cmds.currentTime(q=True)+1)
+    Returns:
+        [List]: Pairs of (min distance, max distance), in the order of the given pairs.
+    """
+    nodes = []
+    lookup = {}
+    for node in (n for pair in pairs for n in pair):
+        if node not in lookup:
+            lookup[node] = len(nodes)
+            nodes.append(node)
 
-    cmds.currentTime(t_og)
+    positions = xformhelper.sample_range(nodes, t_range, start)
+    dists = xformhelper.pair_distances(
+        positions, [(lookup[a], lookup[b]) for a, b in pairs])
 
-    return max(dists)
+    return list(zip(dists.min(axis=0).tolist(), dists.max(axis=0).tolist()))
 
 
 def scale_vec_distance(vec1, vec2, dist):
@@ -322,6 +492,110 @@ def rest_length(first, second, t_range):
     return sc_pos
 
 
+def chain_pairs(joints, chains=static.VideoPoseChains):
+    """
+    Build (parent, child) name pairs from index chains, like static.VideoPoseChains.
+
+    Args:
+        joints ([List, Dict]): Joint names, indexable by the chain indices.
+        chains ([List], optional): Lists of joint indices from parent to child.
+                                   Defaults to static.VideoPoseChains.
+
+    Returns:
+        [List]: Pairs of (parent, child) names, parents always come before their children.
+    """
+    return [(joints[chain[n]], joints[chain[n+1]])
+            for chain in chains for n in range(len(chain) - 1)]
+
+
+def rest_lengths(pairs, t_range, start=None):
+    """
+    Skeleton-level version of rest_length.
+    Scale every bone, in it's pointing direction, by the longest distance it reaches.
+    All joints are sampled in one shared pass and all new positions are
+    applied and keyed in one undo chunk. Afterwards every bone length gets checked
+    against it's sampled max.
+
+    Args:
+        pairs ([List]): Pairs of (parent, child) names, parents before their children,
+                        eg. from chain_pairs.
+        t_range ([Int]): The range in which to check.
+        start ([Float], optional): First frame. Defaults to None, the current time.
+
+    Returns:
+        [Dict]: Child name -> Vector3 List containing the new position.
+    """
+    if not pairs:
+        return {}
+
+    max_dists = [mx for _, mx in get_bone_lengths(pairs, t_range, start)]
+
+    nodes = list({n for pair in pairs for n in pair})
+    cur = dict(zip(nodes, xformhelper.sample_world_positions(
+        nodes, [cmds.currentTime(q=True)])[0]))
+    paths = dict(zip(nodes, cmds.ls(nodes, l=True)))
+
+    new_pos = rest_positions(pairs, max_dists, cur, paths)
+
+    children = [child for _, child in pairs]
+    with mahelper.undo_chunk():
+        for child in children:
+            cmds.xform(child, t=new_pos[child].tolist(), ws=True)
+        cmds.setKeyframe(children, at="translate")
+
+    # -every bone has to end up at it's sampled max
+    res = dict(zip(nodes, xformhelper.sample_world_positions(
+        nodes, [cmds.currentTime(q=True)])[0]))
+    lengths = xformhelper.pair_distances(
+        np.asarray([[res[n] for pair in pairs for n in pair]]),
+        [(2 * n, 2 * n + 1) for n in range(len(pairs))])[0]
+    wrong = [pair for pair, length, dist in zip(pairs, lengths, max_dists)
+             if not np.isclose(length, dist, atol=1e-4)]
+    if wrong:
+        raise RuntimeError("Bone lengths don't match their sampled max: {0}".format(wrong))
+
+    return dict((k, v.tolist()) for k, v in new_pos.items())
+
+
+def rest_positions(pairs, max_dists, cur, paths):
+    """
+    New world positions for rest_lengths, pure math. Moving a joint in the scene moves all
+    of it's dag descendants too, also the ones in other chains (the arms hang below the spine),
+    so every position is taken with the offset of it's nearest moved dag ancestor.
+
+    Args:
+        pairs ([List]): Pairs of (parent, child) names, parents before their children.
+        max_dists ([List]): Target length of every pair.
+        cur ([Dict]): Name -> current world position (np.ndarray).
+        paths ([Dict]): Name -> full dag path, eg. from cmds.ls(l=True).
+
+    Returns:
+        [Dict]: Child name -> new world position (np.ndarray).
+    """
+    shifts = {}
+
+    def shift(node):
+        # -offset of the node itself or it's nearest moved ancestor
+        path = paths[node]
+        while path:
+            if path in shifts:
+                return shifts[path]
+            path = path.rpartition("|")[0]
+        return 0.0
+
+    new_pos = {}
+    for (parent, child), dist in zip(pairs, max_dists):
+        parent_pos = cur[parent] + shift(parent)
+        heading = cur[child] + shift(child) - parent_pos
+        length = np.sqrt((heading * heading).sum())
+        direction = heading / length if length else heading
+
+        new_pos[child] = parent_pos + direction * dist
+        shifts[paths[child]] = new_pos[child] - cur[child]
+
+    return new_pos
+
+
 # ------------------------- Ik-ing skeleton --------------------------- #
 # --------------------------------------------------------------------- #
 
@@ -414,59 +688,172 @@ def ikSpline_transfer(first, second, up_src_jnt, low_src_jnt):
 # --------------------------------------------------------------------- #
 
 
-def loc_transformer(src_jnt):
+def loc_transformers(src_jnts):
     """
-    Creates a locator which will be paired to the incoming connections of the joint.
-    The locator will get zerod on the joint position and its position add to the incoming values.
+    Creates a locator per joint which will be paired to the incoming translate connections of the joint.
+    The locator sits on the joint position with zeroed values, its translation gets added to the incoming values.
     It's used to transform already animated joints without working around keyframes.
-    Use the remove function to establish the original connections.
-
-    Args:
-        src_jnt ([Str]): Joint to transform.
-    """
-    loc = cmds.spaceLocator(n="{0}_translater".format(src_jnt))[0]
 
-    # invert X & Y values of loc
-    loc_mult_name = "{0}_mult".format(loc)
-    loc_mult = cmds.shadingNode(
-        "multiplyDivide", asUtility=True, n=loc_mult_name)
-    cmds.setAttr("{0}.input2".format(loc_mult), -1, -1, 1)
+    All nodes and connections of all joints are made by one MDagModifier. Every locator
+    keeps message connections to it's joint, multiplyDivide and addDoubleLinear nodes,
+    remove_loc_transformer follows those instead of searching by name.
 
-    for c in "YXZ":
-        cmds.connectAttr("{0}.translate{1}".format(loc, c),
-                         "{0}.input1.input1{1}".format(loc_mult, c))
+    Args:
+        src_jnts ([List]): Joints to transform.
 
-    src_pos = cmds.xform(src_jnt, q=True, t=True, ws=True)
-    cmds.xform(loc, t=src_pos, ws=True)
+    Returns:
+        [Tuple]: Names of the locators in joint order and the executed MDagModifier,
+                 call undoIt() on it to revert everything.
+    """
+    mod = api2.MDagModifier()
+
+    sel = api2.MSelectionList()
+    for jnt in src_jnts:
+        sel.add(jnt)
+
+    # -first pass, create the nodes and the registry attributes
+    rigs = []
+    for i, jnt in enumerate(src_jnts):
+        dag = sel.getDagPath(i)
+        jntfn = api2.MFnDependencyNode(dag.node())
+        name = "{0}_translater".format(dag.partialPathName().rsplit("|", 1)[-1])
+
+        loc = mod.createNode("transform")
+        mod.renameNode(loc, name)
+        shape = mod.createNode("locator", loc)
+        mod.renameNode(shape, "{0}Shape".format(name))
+        mult = mod.createNode("multiplyDivide")
+        mod.renameNode(mult, "{0}_mult".format(name))
+
+        # -(axis, anim output, joint input) of every driven translate channel
+        channels = []
+        for c in "XYZ":
+            dst = jntfn.findPlug("translate{0}".format(c), False)
+            src = dst.source()
+            if not src.isNull:
+                channels.append((c, src, dst))
+
+        adds = []
+        for c, _, _ in channels:
+            add = mod.createNode("addDoubleLinear")
+            mod.renameNode(add, "{0}_add{1}".format(jntfn.name(), c))
+            adds.append(add)
+
+        for attr, multi in _locTransformerAttrs:
+            msgfn = api2.MFnMessageAttribute()
+            attr_obj = msgfn.create(attr, attr)
+            msgfn.array = multi
+            mod.addAttribute(loc, attr_obj)
+
+        pos = api2.MFnTransform(dag).translation(api2.MSpace.kWorld)
+        rigs.append((jntfn, loc, shape, mult, channels, adds, pos))
+
+    mod.doIt()
+
+    # -second pass, values and connections on the now existing nodes
+    locs = []
+    for jntfn, loc, shape, mult, channels, adds, pos in rigs:
+        locfn = api2.MFnDagNode(loc)
+        shapefn = api2.MFnDependencyNode(shape)
+        multfn = api2.MFnDependencyNode(mult)
+
+        # -the shape and pivots carry the joint position, the translation stays zero
+        for n, c in enumerate("XYZ"):
+            mod.newPlugValueDouble(shapefn.findPlug("localPosition{0}".format(c), False), pos[n])
+            mod.newPlugValueDouble(locfn.findPlug("rotatePivot{0}".format(c), False), pos[n])
+            mod.newPlugValueDouble(locfn.findPlug("scalePivot{0}".format(c), False), pos[n])
+
+        # invert X & Y values of loc
+        for c, val in zip("XYZ", (-1, -1, 1)):
+            mod.newPlugValueDouble(multfn.findPlug("input2{0}".format(c), False), val)
+            mod.connect(locfn.findPlug("translate{0}".format(c), False),
+                        multfn.findPlug("input1{0}".format(c), False))
+
+        registry = locfn.findPlug("transformerAdds", False)
+        for n, ((c, src, dst), add) in enumerate(zip(channels, adds)):
+            addfn = api2.MFnDependencyNode(add)
+
+            # Connect anim curve to add_double_linear
+            mod.disconnect(src, dst)
+            mod.connect(src, addfn.findPlug("input1", False))
+            # Connect mult_div to add_double linear
+            mod.connect(multfn.findPlug("output{0}".format(c), False),
+                        addfn.findPlug("input2", False))
+            # Connect add_double_linear to joint
+            mod.connect(addfn.findPlug("output", False), dst)
+
+            mod.connect(addfn.findPlug("message", False), registry.elementByLogicalIndex(n))
+
+        mod.connect(jntfn.findPlug("message", False), locfn.findPlug("transformerJoint", False))
+        mod.connect(multfn.findPlug("message", False), locfn.findPlug("transformerMult", False))
+
+        locs.append(locfn)
+
+    mod.doIt()
+
+    return [fn.partialPathName() for fn in locs], mod
 
-    cmds.makeIdentity(loc, apply=True, t=1, r=1, s=1, n=0)  # freeze transforms
 
-    # link joint anims to transformer
-    conns = cmds.listConnections(src_jnt, c=True, d=False, p=True)
-    conn_pairs = [[i, conns[n+1]]
-                  for n, i in enumerate(conns) if n % 2 == 0 if "translate" in i]
+def loc_transformer(src_jnt):
+    """
+    Convenient wrapper for loc_transformers with a single joint.
+    Use the remove function to establish the original connections.
 
-    for dst, src in conn_pairs:
-        add_name = "{0}_add".format(dst.split(".")[0])
-        add_linear = cmds.shadingNode(
-            "addDoubleLinear", asUtility=True, n=add_name)
+    Args:
+        src_jnt ([Str]): Joint to transform.
 
-        # Connect anim curve to add_double_linear
-        cmds.connectAttr(src, "{0}.input1".format(add_linear))
-        # Connect mult_div to add_double linear
-        cmds.connectAttr("{0}.output.output{1}".format(
-            loc_mult, dst[-1]), "{0}.input2".format(add_linear))
-        # Connect add_double_linear to joint
-        cmds.connectAttr("{0}.output".format(add_linear), dst, force=True)
+    Returns:
+        [Str]: Name of the created locator.
+    """
+    return loc_transformers([src_jnt])[0][0]
 
 
 def remove_loc_transformer(loc):
     """
-    Removes the connected location by going upstream from the locator node.
+    Removes the locator and it's nodes, the joint gets it's original connections back.
+    The nodes are found through the message connections made by loc_transformers,
+    locators made before those existed are still found by name.
 
     Args:
         loc ([Str]): Locator transform connected to a joint.
+
+    Returns:
+        [MDagModifier]: The executed modifier, None for the name based removal.
     """
+    locobj = api2.MSelectionList().add(loc).getDependNode(0)
+    locfn = api2.MFnDependencyNode(locobj)
+
+    if not locfn.hasAttribute("transformerMult"):
+        _remove_named_loc_transformer(loc)
+        return None
+
+    mod = api2.MDagModifier()
+
+    registry = locfn.findPlug("transformerAdds", False)
+    for n in range(registry.numConnectedElements()):
+        add = registry.connectionByPhysicalIndex(n).source().node()
+        addfn = api2.MFnDependencyNode(add)
+
+        src = addfn.findPlug("input1", False).source()
+        out = addfn.findPlug("output", False)
+        for dst in out.destinations():
+            mod.disconnect(out, dst)
+            if not src.isNull:
+                mod.connect(src, dst)
+
+        mod.deleteNode(add)
+
+    mult = locfn.findPlug("transformerMult", False).source()
+    if not mult.isNull:
+        mod.deleteNode(mult.node())
+    mod.deleteNode(locobj)
+
+    mod.doIt()
+    return mod
+
+
+def _remove_named_loc_transformer(loc):
+    # -locators without registry, go upstream by the node names
     mult = next(i for i in cmds.listConnections(loc, s=False) if "mult" in i)
     adds = [i for i in cmds.listConnections(mult, s=False) if "add" in i]
     jnt = next(i for i in cmds.listConnections(
@@ -484,7 +871,16 @@ def remove_loc_transformer(loc):
         cmds.delete(i)
 
 
-def export_ma_cam(cam_og=None, save=True, mult=None, locs=True):
+#   Locator Transformer Registry
+# -(name, is array) of the message attributes on the locator
+_locTransformerAttrs = [
+    ("transformerJoint", False),
+    ("transformerMult", False),
+    ("transformerAdds", True),
+]
+
+
+def export_ma_cam(cam_og=None, save=True, mult=None, locs=True, headless=False):
     """
     Export a selected or given camera to something After Effects can understand.
     We first copy the camera at the start position, without keys or inputs.
@@ -499,11 +895,24 @@ def export_ma_cam(cam_og=None, save=True, mult=None, locs=True):
         save ([Bool], optional): Export the created nodes, deletes the exported nodes when true. Defaults to True.
         mult ([Int], optional): The values by which the camera values gets multiplied. Defaults to None.
         locs ([Bool], optional): Generate and export locators on the camera path if true. Defaults to True.
+        headless ([Bool], optional): Sample the camera in one pass and write .ma, .json or .csv
+                                     without touching the scene, see sample_camera. Defaults to False.
+
+    Returns:
+        [Dict]: The sampled camera data in headless mode, None otherwise.
     """
 
     if not cam_og:
         cam_og = cmds.ls(sl=True, l=True)
 
+    if headless:
+        samples = sample_camera(cam_og, mult=mult)
+        if save:
+            outpath = mahelper.save_filePath(ff="Maya ASCII (*.ma);;JSON (*.json);;CSV (*.csv)")
+            if outpath:
+                write_camera(samples, outpath[0], locs)
+        return samples
+
     keytimes = cmds.keyframe(cam_og, q=True)
     start, end = min(keytimes), max(keytimes)
 
@@ -537,28 +946,232 @@ def export_ma_cam(cam_og=None, save=True, mult=None, locs=True):
             cmds.delete(dels)
 
 
-def mult_keyframes(nodes, mult=100):
+def sample_camera(cam, start=None, end=None, step=1, mult=None):
+    """
+    Sample the world transform and lens attributes of a camera over it's key range.
+    Matrix and lens are evaluated in one context pass per frame through xformhelper, the scene
+    isn't duplicated, baked or changed in any way.
+
+    Args:
+        cam ([Str,List]): The camera transform, the first one is taken from a list.
+        start ([Float], optional): First frame. Defaults to None, the first key.
+        end ([Float], optional): Last frame. Defaults to None, the last key.
+        step (Int, optional): Frame step. Defaults to 1.
+        mult ([Float], optional): Multiply the positions to scale the camera for AE. Defaults to None.
+
+    Returns:
+        [Dict]: Name, rotateOrder, frames, translate (frames, 3) and rotate (frames, 3)
+                in ui units and attributes, a dict of (frames,) arrays.
+    """
+    if isinstance(cam, (list, tuple)):
+        cam = cam[0]
+    shape = cmds.listRelatives(cam, shapes=True, type="camera", f=True)[0]
+
+    if start is None or end is None:
+        keytimes = cmds.keyframe([cam, shape], q=True) or [cmds.currentTime(q=True)]
+        start = min(keytimes) if start is None else start
+        end = max(keytimes) if end is None else end
+
+    frames = xformhelper.get_frames(start, end, step)
+    mats, attrs = xformhelper.sample_matrix_attributes(cam, shape, static.CameraAttributes, frames)
+
+    translate = mats[:, 3, :3] * (xformhelper.ui_distance_scale() * (mult or 1))
+
+    # -keep the euler angles continuous, the matrix alone would give flips
+    order = cmds.getAttr("{0}.rotateOrder".format(cam))
+    angle = api2.MAngle(1.0, api2.MAngle.kRadians).asUnits(api2.MAngle.uiUnit())
+    rotate = np.empty((len(frames), 3), dtype=np.float64)
+    last = None
+    for f, mat in enumerate(mats.reshape(len(frames), 16).tolist()):
+        rot = api2.MTransformationMatrix(api2.MMatrix(mat)).rotation().reorder(order)
+        if last is not None:
+            rot = rot.closestSolution(last)
+        rotate[f] = (rot.x, rot.y, rot.z)
+        last = rot
+    rotate *= angle
+
+    return {
+        "name": cam.rsplit("|", 1)[-1].replace(":", "_"),
+        "rotateOrder": order,
+        "frames": frames,
+        "translate": translate,
+        "rotate": rotate,
+        "attributes": dict(zip(static.CameraAttributes, attrs.T)),
+    }
+
+
+def _camera_nulls(samples):
+    # -origin, first, mid and last sampled position, like loc_over_time
+    pos = samples["translate"]
+    return [[0.0, 0.0, 0.0]] + [pos[i].tolist() for i in (0, len(pos) // 2, -1)]
+
+
+def _camera_channels(samples):
+    # -(attribute, node suffix, curve type, values) of every exported channel
+    channels = []
+    for n, axis in enumerate("XYZ"):
+        channels.append(("translate" + axis, "", "animCurveTL", samples["translate"][:, n]))
+    for n, axis in enumerate("XYZ"):
+        channels.append(("rotate" + axis, "", "animCurveTA", samples["rotate"][:, n]))
+    for attr in static.CameraAttributes:
+        channels.append((attr, "Shape", "animCurveTU", samples["attributes"][attr]))
+    return channels
+
+
+def write_camera_ma(samples, path, locs=True):
+    """
+    Write sampled camera data as a small .ma file, a camera with one curve per changing channel.
+    Static channels are set as plain values.
+
+    Args:
+        samples ([Dict]): Camera data as given by sample_camera.
+        path ([Str]): Output path.
+        locs (Bool, optional): Also write locators on the camera path. Defaults to True.
+    """
+    name = samples["name"]
+    frames = samples["frames"].tolist()
+
+    lines = [
+        "//Maya ASCII scene",
+        'requires maya "{0}";'.format(cmds.about(version=True)),
+        "currentUnit -l {0} -a {1} -t {2};".format(
+            cmds.currentUnit(q=True, linear=True),
+            cmds.currentUnit(q=True, angle=True),
+            cmds.currentUnit(q=True, time=True)),
+        'createNode transform -n "{0}";'.format(name),
+        '\tsetAttr ".ro" {0};'.format(samples["rotateOrder"]),
+        'createNode camera -n "{0}Shape" -p "{0}";'.format(name),
+    ]
+
+    connects = []
+    for attr, suffix, crv_type, values in _camera_channels(samples):
+        node = name + suffix
+        values = values.tolist()
+
+        if all(v == values[0] for v in values):
+            lines.append('select -ne "{0}";'.format(node))
+            lines.append('\tsetAttr ".{0}" {1!r};'.format(attr, values[0]))
+            continue
+
+        crv = "{0}_{1}".format(node, attr)
+        keys = " ".join("{0!r} {1!r}".format(t, v) for t, v in zip(frames, values))
+        lines.append('createNode {0} -n "{1}";'.format(crv_type, crv))
+        lines.append('\tsetAttr -s {0} ".ktv[0:{1}]" {2};'.format(
+            len(frames), len(frames) - 1, keys))
+        connects.append('connectAttr "{0}.o" "{1}.{2}";'.format(crv, node, attr))
+
+    if locs:
+        for n, pos in enumerate(_camera_nulls(samples)):
+            null = "NULL_{0}".format(n)
+            lines.append('createNode transform -n "{0}";'.format(null))
+            lines.append('\tsetAttr ".t" -type "double3" {0!r} {1!r} {2!r};'.format(*pos))
+            lines.append('createNode locator -n "{0}Shape" -p "{0}";'.format(null))
+
+    with open(path, "w") as f:
+        f.write("\n".join(lines + connects) + "\n")
+
+
+def write_camera_json(samples, path, locs=True):
+    """
+    Write sampled camera data as compact JSON, one list per channel.
+
+    Args:
+        samples ([Dict]): Camera data as given by sample_camera.
+        path ([Str]): Output path.
+        locs (Bool, optional): Also write the positions of the path nulls. Defaults to True.
+    """
+    data = {
+        "name": samples["name"],
+        "rotateOrder": samples["rotateOrder"],
+        "frames": samples["frames"].tolist(),
+        "translate": samples["translate"].tolist(),
+        "rotate": samples["rotate"].tolist(),
+        "attributes": dict((k, v.tolist()) for k, v in samples["attributes"].items()),
+    }
+    if locs:
+        data["nulls"] = _camera_nulls(samples)
+
+    with open(path, "w") as f:
+        json.dump(data, f, separators=(",", ":"))
+
+
+def write_camera_csv(samples, path, locs=True):
+    """
+    Write sampled camera data as CSV, one row per frame.
+
+    Args:
+        samples ([Dict]): Camera data as given by sample_camera.
+        path ([Str]): Output path.
+        locs (Bool, optional): Unused, CSV has no room for the path nulls. Defaults to True.
+    """
+    channels = _camera_channels(samples)
+    table = np.column_stack([samples["frames"]] + [c[3] for c in channels])
+
+    with open(path, "w") as f:
+        f.write(",".join(["frame"] + [c[0] for c in channels]) + "\n")
+        for row in table.tolist():
+            f.write(",".join(repr(v) for v in row) + "\n")
+
+
+def write_camera(samples, path, locs=True):
+    """
+    Write sampled camera data, the format is picked by the file extension (.ma, .json, .csv).
+
+    Args:
+        samples ([Dict]): Camera data as given by sample_camera.
+        path ([Str]): Output path.
+        locs (Bool, optional): Also write the path nulls where the format allows. Defaults to True.
+    """
+    ext = path[path.rfind("."):].lower()
+    if ext not in _cameraWriters:
+        raise ValueError("Unsupported camera export format: {0}".format(ext))
+
+    _cameraWriters[ext](samples, path, locs)
+
+
+#   Camera Writer Switch-Case
+_cameraWriters = {
+    ".ma": write_camera_ma,
+    ".json": write_camera_json,
+    ".csv": write_camera_csv,
+}
+
+
+def mult_keyframes(nodes, mult=100, factors=None, change=None):
     """
     Multiply all keyframes by the given value.
+    Every curve is read into an array, scaled and written back through it's function set,
+    curves don't need to share the same key count.
 
     Args:
         nodes ([Str,List]): Name of the nodes on which to work, also works with list of names.
         mult ([Int], optional): The multiplication value. Defaults to 100.
+        factors ([Dict], optional): Per channel factors by long attribute name, like
+                                    {'translateX': -1, 'rotate': 1}, channels not
+                                    listed use mult. Defaults to None.
+        change ([MAnimCurveChange], optional): Records the edit, a new one is made when None.
+                                               Defaults to None.
+
+    Returns:
+        [MAnimCurveChange]: Call undoIt() to revert the edit.
     """
-    anims = cmds.keyframe(nodes, q=True, n=True)
-    keys = cmds.keyframe(nodes, q=True, vc=True, tc=True)
-    frac = len(keys)/len(anims)
+    factors = factors or {}
+    if change is None:
+        change = api2a.MAnimCurveChange()
 
-    keys = [keys[frac*i:frac*(i+1)] for i in range(len(anims))]
-    keys = [[k[i:i+2] for i in range(len(k)) if i % 2 == 0] for k in keys]
+    for data in curvehelper.read_node_curves(nodes):
+        factor = mult
+        if factors:
+            attrs = curvehelper.output_attributes(curvehelper.get_animFn(data.name))
+            factor = next((factors[a] for a in attrs if a in factors), mult)
 
-    for nd, data in zip(anims, keys):
+        if factor == 1:
+            continue
 
-        for vals in data:
-            time, val = vals
-            val *= mult
+        data.values *= factor
+        curvehelper.set_values(data, data.values, change)
 
-            cmds.setKeyframe(nd, v=val, t=time)
+    return change
 
 
 def loc_over_time(node):
@@ -594,6 +1207,7 @@ def loc_over_time(node):
 def unchanging_animCurves(nodes):
     """
     Find unchanging keyframes on the selected objects.
+    Uses the shared curve statistics, curves which didn't change since the last call aren't read again.
 
     Args:
         nodes ([List]): List containing the nodes to check.
@@ -601,13 +1215,9 @@ def unchanging_animCurves(nodes):
     Returns:
         [List]: List of pairs containing the animation curve and unchanging value.
     """
-    conns = [cmds.listConnections(s, t="animCurve") for s in nodes]
-    anims = pyhelper.flatten(conns)
+    stats = curvehelper.curve_stats(curvehelper.list_anim_curves(nodes))
 
-    def get_set(x): return {val for val in cmds.keyframe(x, q=True, vc=True)}
-    def check(x): return len(get_set(x)) == 1
-    unchanged = [[anim, get_set(anim).pop()]
-                 for anim in anims if anim and check(anim)]
+    unchanged = [[st.name, st.min] for st in stats if st.isStatic]
 
     return unchanged
 
@@ -668,46 +1278,120 @@ def get_keyframe_len(keys, cur_range):
     return len(keys[srt:cur_idx+1])
 
 
-def unchanging_ranges(nodes):
+def unchanging_ranges(nodes, tolerance=0.0, min_length=3):
     """
     Find unchanging periods of time for keyframes on the given nodes.
+    Every curve is read once and run-length encoded in a single pass.
 
     Args:
         nodes ([List]): List containing nodes which should be checked.
+        tolerance (Float, optional): Allowed value deviation inside an unchanging period. Defaults to 0.0.
+        min_length (Int, optional): Minimal number of keys of an unchanging period. Defaults to 3.
 
     Returns:
-        [List]: List containing the node and lists of ranges (start idx, end idx) of unchanging values.
+        [List]: List containing the node and lists of ranges (start, end) of the interior keys
+                of unchanging values, start and end are key times.
     """
-    anims = [cmds.listConnections(n, t="animCurve") for n in nodes]
-    anims = pyhelper.flatten(anims)
-
     anim_ranges = []
-    for anim in anims:
-        if not anim:
-            continue
+    for data in curvehelper.read_node_curves(nodes):
+        key_ranges = keyhelper.static_ranges(
+            data.times, data.values, tolerance, min_length)
+
+        if key_ranges:
+            anim_ranges.append([data.name, key_ranges])
+
+    return anim_ranges
+
+
+def remove_static_keys(top_parent, tolerance=0.0, min_length=3):
+    """
+    Remove the redundant interior keys of unchanging periods on every animation curve
+    under the given hierarchy. The first and last key of every period are kept so the
+    curves stay the same. Raw captures key every frame on every channel, most of those
+    keys can go.
+    Each curve is read once and cleaned with a single cutKey, everything in one undo chunk.
 
-        keys = cmds.keyframe(anim, q=True, vc=True, tc=True)
-        keys = [[v, keys[n+1]] for n, v in enumerate(keys) if n % 2 == 0]
+    Args:
+        top_parent ([Str]): Name of the top most node.
+        tolerance (Float, optional): Allowed value deviation inside an unchanging period. Defaults to 0.0.
+        min_length (Int, optional): Minimal number of keys of an unchanging period. Defaults to 3.
+
+    Returns:
+        [Dict]: Report with the number of curves, keys before, removed keys per curve,
+                the removed key data in bytes (time and value doubles) and the estimated
+                bytes saved in a .ma file.
+    """
+    curves = curvehelper.read_curves(
+        curvehelper.list_hierarchy_curves(top_parent))
+
+    report = {"curves": len(curves), "keys": 0, "removed": 0,
+              "data_bytes": 0, "ma_bytes": 0, "per_curve": {}}
 
-        ranges = get_key_ranges(keys)
+    with mahelper.undo_chunk():
+        for data in curves:
+            report["keys"] += len(data)
 
-        key_ranges = []
-        for n, r in enumerate(ranges):
-            # find num of keys in range
-            if get_keyframe_len(keys, r) <= 2:
+            runs = keyhelper.static_runs(data.values, tolerance, max(min_length, 3))
+            if not runs:
                 continue
 
-            start = ranges[n-1]["time"] + 1 if n != 0 else 1
-            end = r["time"]
+            idx = keyhelper.interior_indices(runs)
+            curvehelper.cut_ranges(
+                data.name, [(data.times[s + 1], data.times[e - 1]) for s, e in runs])
 
-            diff = end - start
-            if diff >= 2:
-                #cmds.cutKey(node, time=(start+1, end-1), clear=True)
-                # key_ranges.append(int(start + 1))
-                # key_ranges.append(int(end - 1))
-                key_ranges.append((int(start + 1), int(end - 1)))
+            report["removed"] += len(idx)
+            report["ma_bytes"] += keyhelper.ma_key_bytes(
+                data.times[idx], data.values[idx])
+            report["per_curve"][data.name] = len(idx)
 
-        if key_ranges:
-            anim_ranges.append([anim, key_ranges])
+    # -time and value as double per key
+    report["data_bytes"] = report["removed"] * 16
 
-    return anim_ranges
+    print("[LOG] Removed {0} of {1} keys on {2} curves, ~{3:.1f} KB less in .ma.".format(
+        report["removed"], report["keys"], report["curves"], report["ma_bytes"] / 1024.0))
+
+    return report
+
+
+def reduce_keys(top_parent, tolerances=None, tangent=None):
+    """
+    Reduce the keys of every animation curve under the given hierarchy, meant for
+    baked animation with a key on every frame (bakeResults, VideoPose3D_Importer).
+    Each curve is reduced with keyhelper.reduce_indices and written back
+    with a single addKeys call.
+    The edits are recorded in a MAnimCurveChange, they aren't part of maya's undo queue,
+    use report["change"].undoIt() to revert them.
+
+    Args:
+        top_parent ([Str]): Name of the top most node.
+        tolerances ([Dict], optional): Allowed deviation per curve kind ('linear', 'angular', 'time', 'unitless'),
+                                       merged into static.KeyReductionTolerance. Defaults to None.
+        tangent ([Int], optional): Tangent type of the written keys, linear tangents keep the
+                                   reduced curve within the tolerance. Defaults to None (linear).
+
+    Returns:
+        [Dict]: Report with the number of curves, keys before and after and the MAnimCurveChange.
+    """
+    tols = dict(static.KeyReductionTolerance)
+    tols.update(tolerances or {})
+    if tangent is None:
+        tangent = api2a.MFnAnimCurve.kTangentLinear
+
+    change = api2a.MAnimCurveChange()
+    report = {"curves": 0, "keys": 0, "reduced": 0, "change": change}
+
+    for data in curvehelper.read_curves(curvehelper.list_hierarchy_curves(top_parent)):
+        report["curves"] += 1
+        report["keys"] += len(data)
+
+        idx = keyhelper.reduce_indices(data.times, data.values, tols[data.kind])
+        report["reduced"] += len(idx)
+
+        if len(idx) < len(data):
+            curvehelper.write_curve(
+                data, data.times[idx], data.values[idx], tangent, change)
+
+    print("[LOG] Reduced {0} keys to {1} on {2} curves.".format(
+        report["keys"], report["reduced"], report["curves"]))
+
+    return report
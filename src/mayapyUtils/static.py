@@ -1,4 +1,8 @@
-import maya.api.OpenMaya as api2
+try:
+    import maya.api.OpenMaya as api2
+except ImportError:
+    # -offline tools (aimocap, posehelper) only need the plain data
+    api2 = None
 
 
 # -------------------- Server/Client Information ---------------------- #
@@ -32,15 +36,12 @@ VideoPoseNames = {0: "Hip", 1: "rThigh", 2: "rShin", 3: "rFoot",
 VideoPoseNamesRev = {v: k for k, v in VideoPoseNames.items()}
 
 aimocap_commands = ["""
-    import json
-    from mayapyUtils import mahelper
+    from mayapyUtils import mahelper, pose2maya, posehelper
 
     json_file = mahelper.get_filePath(ff="*.json", cap="Open .json file.")
     if json_file:
-        with open(json_file[0]) as json_data:
-            data = json.load(json_data)
-
-        mahelper.VideoPose3DMayaServer(parent=mahelper.getMayaWin(),mult=1,static=True).process_data(data)
+        frames = posehelper.iter_json_frames(json_file[0])
+        pose2maya.VideoPose3D_Importer(mult=1).create_skeleton(frames)
     """, """
     from mayapyUtils import mahelper
 
@@ -72,10 +73,26 @@ VideoPoseChains = [[0, 1, 2, 3], [0, 4, 5, 6], [7, 8, 9, 10], [11, 12, 13], [14,
 
 Skips = [0, 7, 11, 14]
 
+# -camera rotation (quaternion) used to bring the predictions into world space
+VideoPoseCameraRotation = [0.14070565, -0.15007018, -0.7552408, 0.62232804]
+
+# --------------------- Righelper information ------------------------- #
+# --------------------------------------------------------------------- #
+
+# -allowed deviation per curve kind for the key reduction,
+#   linear in ui distance units (translate), angular in degrees (rotate)
+KeyReductionTolerance = {"linear": 0.01, "angular": 0.1,
+                         "time": 0.0, "unitless": 0.001}
+
+# -camera shape attributes sampled by the headless camera export
+#   only unitless ones, they are written to unitless curves as they are
+CameraAttributes = ["focalLength", "horizontalFilmAperture",
+                    "verticalFilmAperture", "fStop"]
+
 # --------------------- BasicMayaIO information ----------------------- #
 # --------------------------------------------------------------------- #
 
 AIDEFAULT = "aiStandardSurface"
 
-APIENUM_strToNum = vars(api2.MFn)
+APIENUM_strToNum = vars(api2.MFn) if api2 else {}
 APIENUM_numToStr = {v: k for k, v in APIENUM_strToNum.items()}
@@ -0,0 +1,403 @@
+import maya.api.OpenMaya as api2
+import maya.cmds as cmds
+import numpy as np
+import mahelper
+
+
+# ------------------------- Sampling Over Time ------------------------ #
+# --------------------------------------------------------------------- #
+
+
+def ui_distance_scale():
+    """
+    Factor which converts internal distances (centimeters) into ui distance units.
+
+    Returns:
+        [Float]: Conversion factor.
+    """
+    return api2.MDistance(1.0, api2.MDistance.kCentimeters).asUnits(api2.MDistance.uiUnit())
+
+
+def get_worldMatrix_plugs(nodes):
+    """
+    Get the worldMatrix plug of every given dag node, for the instance the name points to.
+
+    Args:
+        nodes ([List]): Names of the dag nodes.
+
+    Returns:
+        [List]: MPlugs of the worldMatrix elements.
+    """
+    sel = api2.MSelectionList()
+    for node in nodes:
+        sel.add(node)
+
+    plugs = []
+    for i in range(len(nodes)):
+        dag = sel.getDagPath(i)
+        plug = api2.MFnDagNode(dag).findPlug("worldMatrix", False)
+        plugs.append(plug.elementByLogicalIndex(dag.instanceNumber()))
+
+    return plugs
+
+
+def get_frames(start, end, step=1):
+    """
+    Frames between start and end, both inclusive.
+
+    Args:
+        start ([Float]): First frame.
+        end ([Float]): Last frame.
+        step (Int, optional): Frame step. Defaults to 1.
+
+    Returns:
+        [np.ndarray]: Float64 array of frames.
+    """
+    return np.arange(start, end + step * 0.5, step, dtype=np.float64)
+
+
+def sample_world_matrices(nodes, frames):
+    """
+    Evaluate the world matrices of many nodes over the given frames.
+    Every frame is evaluated through a MDGContext, the timeline isn't moved
+    and the scene isn't re-evaluated as a whole.
+
+    Args:
+        nodes ([List]): Names of the dag nodes.
+        frames ([np.ndarray, List]): Frames, in ui time units.
+
+    Returns:
+        [np.ndarray]: Array of shape (frames, nodes, 4, 4), translations in centimeters.
+    """
+    plugs = get_worldMatrix_plugs(nodes)
+    unit = api2.MTime.uiUnit()
+
+    res = np.empty((len(frames), len(plugs), 16), dtype=np.float64)
+    for f, frame in enumerate(np.asarray(frames, dtype=np.float64).tolist()):
+        ctx = api2.MDGContext(api2.MTime(frame, unit))
+
+        for n, plug in enumerate(plugs):
+            res[f, n] = list(api2.MFnMatrixData(plug.asMObject(ctx)).matrix())
+
+    return res.reshape(len(frames), len(plugs), 4, 4)
+
+
+def sample_world_positions(nodes, frames):
+    """
+    World space positions of many nodes over the given frames, in one pass.
+    Same numbers cmds.xform(q=True, t=True, ws=True) gives on every frame.
+
+    Args:
+        nodes ([List]): Names of the dag nodes.
+        frames ([np.ndarray, List]): Frames, in ui time units.
+
+    Returns:
+        [np.ndarray]: Array of shape (frames, nodes, 3) in ui distance units.
+    """
+    pos = sample_world_matrices(nodes, frames)[:, :, 3, :3]
+
+    scale = ui_distance_scale()
+    if scale != 1.0:
+        pos = pos * scale
+
+    return np.ascontiguousarray(pos)
+
+
+def sample_attributes(node, attrs, frames):
+    """
+    Evaluate numeric attributes of a node over the given frames, through a MDGContext
+    per frame like sample_world_matrices. Values are in internal units, for camera
+    attributes like focalLength these are the ui numbers.
+
+    Args:
+        node ([Str]): Name of the node.
+        attrs ([List]): Long names of the attributes.
+        frames ([np.ndarray, List]): Frames, in ui time units.
+
+    Returns:
+        [np.ndarray]: Array of shape (frames, attrs).
+    """
+    plugs = _attribute_plugs(node, attrs)
+    unit = api2.MTime.uiUnit()
+
+    res = np.empty((len(frames), len(plugs)), dtype=np.float64)
+    for f, frame in enumerate(np.asarray(frames, dtype=np.float64).tolist()):
+        ctx = api2.MDGContext(api2.MTime(frame, unit))
+        res[f] = [plug.asDouble(ctx) for plug in plugs]
+
+    return res
+
+
+def sample_matrix_attributes(node, attr_node, attrs, frames):
+    """
+    World matrix of a dag node and numeric attributes of a (maybe other) node in a single
+    pass, both are evaluated under the same MDGContext per frame. Meant for cameras,
+    the transform gives the matrix and the shape the lens attributes.
+
+    Args:
+        node ([Str]): Name of the dag node.
+        attr_node ([Str]): Name of the node holding the attributes.
+        attrs ([List]): Long names of the attributes.
+        frames ([np.ndarray, List]): Frames, in ui time units.
+
+    Returns:
+        [Tuple]: Matrices of shape (frames, 4, 4), translations in centimeters,
+                 and values of shape (frames, attrs) like sample_attributes.
+    """
+    mat_plug = get_worldMatrix_plugs([node])[0]
+    plugs = _attribute_plugs(attr_node, attrs)
+    unit = api2.MTime.uiUnit()
+
+    mats = np.empty((len(frames), 16), dtype=np.float64)
+    res = np.empty((len(frames), len(plugs)), dtype=np.float64)
+    for f, frame in enumerate(np.asarray(frames, dtype=np.float64).tolist()):
+        ctx = api2.MDGContext(api2.MTime(frame, unit))
+
+        mats[f] = list(api2.MFnMatrixData(mat_plug.asMObject(ctx)).matrix())
+        res[f] = [plug.asDouble(ctx) for plug in plugs]
+
+    return mats.reshape(len(frames), 4, 4), res
+
+
+def _attribute_plugs(node, attrs):
+    depfn = api2.MFnDependencyNode(api2.MSelectionList().add(node).getDependNode(0))
+    return [depfn.findPlug(attr, False) for attr in attrs]
+
+
+def sample_range(nodes, t_range, start=None):
+    """
+    Convenient wrapper, sample the world positions for t_range frames.
+
+    Args:
+        nodes ([List]): Names of the dag nodes.
+        t_range ([Int]): Number of frames.
+        start ([Float], optional): First frame. Defaults to None, the current time.
+
+    Returns:
+        [np.ndarray]: Array of shape (frames, nodes, 3) in ui distance units.
+    """
+    if start is None:
+        start = cmds.currentTime(q=True)
+
+    return sample_world_positions(nodes, get_frames(start, start + int(t_range) - 1))
+
+
+# ------------------------- Batched Transforms ------------------------ #
+# --------------------------------------------------------------------- #
+
+
+class TransformBatch(object):
+    """
+    Translations of many transforms in one array, read once through the API and written
+    back in one undo chunk. Translations are in ui distance units, 'local' is the
+    translate attribute (same as cmds.xform(q=True, t=True)), 'world' the world position.
+
+    Edit the local array in place or with the helper methods, then call write().
+    Only local translations are written, the world ones are for reading.
+
+    Args:
+        nodes ([List]): Names of the transforms.
+    """
+
+    def __init__(self, nodes):
+        self.nodes = list(nodes)
+        self._written = None
+
+        sel = api2.MSelectionList()
+        for node in self.nodes:
+            sel.add(node)
+
+        self._dags = [sel.getDagPath(i) for i in range(len(self.nodes))]
+        self._fns = [api2.MFnTransform(dag) for dag in self._dags]
+        self._scale = ui_distance_scale()
+
+        self.local = self._read(api2.MSpace.kTransform)
+        self._original = self.local.copy()
+
+    @classmethod
+    def from_hierarchy(cls, top_parent, include_top=True):
+        """
+        Batch of a node and all of it's descendant transforms, parents before children.
+
+        Args:
+            top_parent ([Str]): Name of the top most node.
+            include_top (Bool, optional): If True the top node is the first row. Defaults to True.
+
+        Returns:
+            [TransformBatch]: The new batch.
+        """
+        nodes = cmds.listRelatives(top_parent, ad=True, f=True) or []
+        nodes = sorted(cmds.ls(nodes, type="transform", l=True) if nodes else [])
+        if include_top:
+            nodes.insert(0, top_parent)
+
+        return cls(nodes)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def _read(self, space):
+        res = np.empty((len(self._fns), 3), dtype=np.float64)
+        for n, fn in enumerate(self._fns):
+            vec = fn.translation(space)
+            res[n] = (vec.x, vec.y, vec.z)
+
+        return res * self._scale
+
+    def world(self):
+        """
+        Read the current world positions, like cmds.xform(q=True, t=True, ws=True).
+
+        Returns:
+            [np.ndarray]: Array of shape (nodes, 3).
+        """
+        return self._read(api2.MSpace.kWorld)
+
+    def rows(self, nodes):
+        """
+        Row indices of the given nodes, names have to match the ones the batch got.
+
+        Args:
+            nodes ([List]): Names of the transforms.
+
+        Returns:
+            [List]: Row indices.
+        """
+        lookup = dict((node, n) for n, node in enumerate(self.nodes))
+        return [lookup[node] for node in nodes]
+
+    def zero(self, axes, rows=None):
+        """
+        Zero local translation axes.
+
+        Args:
+            axes ([List]): Axis indices, 0 = X, 1 = Y, 2 = Z.
+            rows ([List], optional): Row indices to edit. Defaults to None, all rows.
+        """
+        rows = slice(None) if rows is None else rows
+        for axis in axes:
+            self.local[rows, axis] = 0.0
+
+    def mirror(self, axis=0, rows=None):
+        """
+        Flip the sign of a local translation axis.
+
+        Args:
+            axis (Int, optional): Axis index. Defaults to 0, X.
+            rows ([List], optional): Row indices to edit. Defaults to None, all rows.
+        """
+        rows = slice(None) if rows is None else rows
+        self.local[rows, axis] *= -1
+
+    def write(self):
+        """
+        Write the changed local translations back, one setAttr per changed transform
+        in a single undo chunk, so Ctrl+Z reverts the whole write.
+        undo() reverts it too, without going through maya's undo queue.
+
+        Returns:
+            [List]: Names of the written transforms.
+        """
+        changed = np.flatnonzero((self.local != self._original).any(axis=1)).tolist()
+
+        with mahelper.undo_chunk():
+            for n in changed:
+                cmds.setAttr("{0}.translate".format(self.nodes[n]), *self.local[n].tolist())
+
+        self._written = (changed, self._original[changed])
+        self._original = self.local.copy()
+
+        return [self.nodes[n] for n in changed]
+
+    def undo(self):
+        """
+        Revert the last write.
+        """
+        if self._written is None:
+            return
+
+        changed, previous = self._written
+        with mahelper.undo_chunk():
+            for n, val in zip(changed, previous.tolist()):
+                cmds.setAttr("{0}.translate".format(self.nodes[n]), *val)
+
+        self._written = None
+        self.local = self._read(api2.MSpace.kTransform)
+        self._original = self.local.copy()
+
+
+# ---------------------------- Distances ------------------------------ #
+# --------------------------------------------------------------------- #
+
+
+def pair_distances(positions, pairs):
+    """
+    Distances between pairs of nodes for every sampled frame.
+
+    Args:
+        positions ([np.ndarray]): Array of shape (frames, nodes, 3).
+        pairs ([List]): Pairs of (first, second) node indices into the positions.
+
+    Returns:
+        [np.ndarray]: Array of shape (frames, pairs).
+    """
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    delta = positions[:, pairs[:, 0]] - positions[:, pairs[:, 1]]
+
+    return np.sqrt((delta * delta).sum(axis=-1))
+
+
+# --------------------------- Nearest Points -------------------------- #
+# --------------------------------------------------------------------- #
+
+
+def nearest_on_segment(start, end, pnts):
+    """
+    Project points onto the line segment between start and end, pure math.
+    Same result as a 'nearestPointOnCurve' node on a straight degree 1 curve.
+
+    Args:
+        start ([List]): Vector3 List of the segment start.
+        end ([List]): Vector3 List of the segment end.
+        pnts ([List, np.ndarray]): Vector3 points, shape (n, 3).
+
+    Returns:
+        [np.ndarray]: Nearest positions, shape (n, 3).
+    """
+    start = np.asarray(start, dtype=np.float64)
+    pnts = np.asarray(pnts, dtype=np.float64).reshape(-1, 3)
+    axis = np.asarray(end, dtype=np.float64) - start
+
+    length_sq = axis.dot(axis)
+    if not length_sq:
+        return np.repeat(start[None], len(pnts), axis=0)
+
+    param = np.clip((pnts - start).dot(axis) / length_sq, 0.0, 1.0)
+    return start + param[:, None] * axis
+
+
+def nearest_on_curve(curve, pnts):
+    """
+    Query the closest points on a nurbs curve for many points with one function set,
+    no scene nodes get created. Works in world space.
+
+    Args:
+        curve ([Str]): Name of the curve transform or shape.
+        pnts ([List, np.ndarray]): Vector3 points in ui units, shape (n, 3).
+
+    Returns:
+        [np.ndarray]: Nearest positions in ui units, shape (n, 3).
+    """
+    dag = api2.MSelectionList().add(curve).getDagPath(0)
+    dag.extendToShape()
+    curvefn = api2.MFnNurbsCurve(dag)
+
+    scale = ui_distance_scale()
+    pnts = np.asarray(pnts, dtype=np.float64).reshape(-1, 3) / scale
+
+    res = np.empty_like(pnts)
+    for n, pnt in enumerate(pnts.tolist()):
+        near, _ = curvefn.closestPoint(api2.MPoint(pnt), space=api2.MSpace.kWorld)
+        res[n] = (near.x, near.y, near.z)
+
+    return res * scale